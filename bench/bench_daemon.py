@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+import socket
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from daemon import request, DEFAULT_SOCKET  # noqa: E402
+
+
+def main():
+    # Start the daemon first: python src/daemon.py
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_SOCKET
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    envelope = sys.argv[3] if len(sys.argv) > 3 else os.path.join(ROOT, "vectors", "invalid_targetref.json")
+    with open(envelope, "rb") as f:
+        raw = f.read()
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    lat = []
+    with sock:
+        for _ in range(n):
+            t0 = time.perf_counter_ns()
+            request(path, raw, sock=sock)
+            lat.append(time.perf_counter_ns() - t0)
+
+    lat.sort()
+    print(f"requests={n} envelope={os.path.basename(envelope)}")
+    print(f"p50={lat[n // 2] / 1e3:.1f}us p99={lat[int(n * 0.99)] / 1e3:.1f}us mean={statistics.fmean(lat) / 1e3:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
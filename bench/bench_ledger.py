@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import tempfile
+from typing import Dict, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from ledger import LedgerWriter  # noqa: E402
+from run_vectors import _append_jsonl  # noqa: E402
+
+
+def _row(i: int) -> Dict[str, Any]:
+    ok = i % 8 == 0
+    return {
+        "kind": "RECEIPT" if ok else "TOMBSTONE",
+        "ts": 1700000000,
+        "file": f"env_{i:08d}.json",
+        "proposal_digest": "a" * 64,
+        "action_class": "EXTERNAL",
+        "energy_est_uj": 100000,
+        "epoch": 1,
+        "nonce": i,
+        "allow": ok,
+        "reason_code": "OK" if ok else "witness_mismatch",
+    }
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = [_row(i) for i in range(n)]
+
+    with tempfile.TemporaryDirectory() as d:
+        per_row = (os.path.join(d, "a_receipts.jsonl"), os.path.join(d, "a_tombstone.jsonl"))
+        t0 = time.perf_counter()
+        for r in rows:
+            _append_jsonl(per_row[0] if r["allow"] else per_row[1], r)
+        t_per_row = time.perf_counter() - t0
+
+        buffered = (os.path.join(d, "b_receipts.jsonl"), os.path.join(d, "b_tombstone.jsonl"))
+        t0 = time.perf_counter()
+        with LedgerWriter(*buffered) as ledger:
+            for r in rows:
+                if r["allow"]:
+                    ledger.append_receipt(r)
+                else:
+                    ledger.append_tombstone(r)
+            ledger.fsync()
+        t_buffered = time.perf_counter() - t0
+
+        for a, b in zip(per_row, buffered):
+            with open(a, "rb") as fa, open(b, "rb") as fb:
+                assert fa.read() == fb.read()
+
+    print(f"rows={n}")
+    print(f"per-row open/append/close : {n / t_per_row:12,.0f} rows/s")
+    print(f"LedgerWriter (+1 fsync)   : {n / t_buffered:12,.0f} rows/s ({t_per_row / t_buffered:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import subprocess
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from verifier import (  # noqa: E402
+    REASON,
+    verify,
+    verify_bytes,
+    parse_envelope,
+    compile_anchors,
+    compute_witness_hash,
+    _build_graph,
+    _check_topology,
+    _canonical_json_bytes,
+)
+from gen_envelopes import make_envelope, SHAPES, ANCHOR_PATH  # noqa: E402
+
+DEFAULT_OUTPUT = os.path.join(ROOT, "out", "bench_results.json")
+
+# Reason each generator variant must produce; a case that disagrees aborts the run
+_EXPECTED = {
+    "valid": "OK",
+    "cycle": REASON["TOPO"],
+    "unreachable": REASON["TOPO"],
+    "over_budget": REASON["BUDGET"],
+    "bad_witness": REASON["WITNESS"],
+}
+
+# Bump when case definitions or metrics change, so old result files are not compared blindly
+SUITE_VERSION = 2
+
+
+def _cases(full: bool) -> List[Tuple[str, str, int, int]]:
+    # (shape, variant, nodes, payload_bytes)
+    sizes = [10, 100, 1_000, 10_000, 100_000] + ([1_000_000] if full else [])
+    cases = [(shape, "valid", n, 0) for shape in SHAPES for n in sizes]
+    for n in sizes[2:]:
+        cases.append(("deep", "cycle", n, 0))
+        cases.append(("near_cycle", "cycle", n, 0))
+        cases.append(("chain", "unreachable", n, 0))
+    cases.append(("chain", "over_budget", 1_000, 0))
+    cases.append(("chain", "bad_witness", 1_000, 0))
+    for payload in [1 << 20, 8 << 20] + ([64 << 20] if full else []):
+        cases.append(("chain", "valid", 100, payload))
+    return cases
+
+
+def _case_name(shape: str, variant: str, nodes: int, payload: int) -> str:
+    return f"{shape}/{variant}/n={nodes}" + (f"/payload={payload}" if payload else "")
+
+
+def _time_ns(fn: Callable[[], Any], min_total_ns: int, max_repeat: int) -> int:
+    # Best single-call time; repeats until min_total_ns has been spent (at least once, at most max_repeat)
+    best = None
+    spent = 0
+    for _ in range(max_repeat):
+        t0 = time.perf_counter_ns()
+        fn()
+        dt = time.perf_counter_ns() - t0
+        best = dt if best is None else min(best, dt)
+        spent += dt
+        if spent >= min_total_ns:
+            break
+    return best
+
+
+def _run_case(
+    shape: str, variant: str, nodes: int, payload: int, anchors: Dict[str, Any], min_total_ns: int, max_repeat: int
+) -> Dict[str, Any]:
+    snapshot = compile_anchors(anchors)
+    env = make_envelope(shape, nodes, variant, payload, anchors=anchors)
+    raw = _canonical_json_bytes(env)
+    tcc = env["tcc"]
+    env_wo = dict(env)
+    env_wo.pop("witness_hash")
+    graph, _ = _build_graph(tcc)
+
+    ok, reason, debug = verify(env, snapshot)
+    if reason != _EXPECTED[variant] or verify(env, snapshot, reject_fast=True)[1] != reason:
+        raise SystemExit(f"{shape}/{variant}/{nodes}: expected {_EXPECTED[variant]}, got {reason} {debug}")
+
+    metrics = {
+        "parse_envelope": lambda: parse_envelope(raw),
+        "build_graph": lambda: _build_graph(tcc),
+        "check_topology": lambda: _check_topology(graph, tcc["root"], tcc["receipt"]),
+        "witness_hash": lambda: compute_witness_hash(env_wo),
+        "verify": lambda: verify(env, snapshot),
+        "verify_reject_fast": lambda: verify(env, snapshot, reject_fast=True),
+        "verify_bytes": lambda: verify_bytes(raw, snapshot),
+    }
+    return {
+        "name": _case_name(shape, variant, nodes, payload),
+        "shape": shape,
+        "variant": variant,
+        "nodes": len(tcc["nodes"]),
+        "edges": len(tcc["edges"]),
+        "payload_bytes": payload,
+        "envelope_bytes": len(raw),
+        "reason": reason,
+        "ns": {m: _time_ns(fn, min_total_ns, max_repeat) for m, fn in metrics.items()},
+    }
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def _compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> int:
+    # Prints new/base per case and metric; returns the number of ratios above threshold
+    if base.get("suite_version") != new.get("suite_version"):
+        print(f"warning: suite_version {base.get('suite_version')} vs {new.get('suite_version')}")
+    old_cases = {c["name"]: c for c in base.get("cases", [])}
+    regressions = 0
+    for case in new["cases"]:
+        old = old_cases.get(case["name"])
+        if old is None:
+            continue
+        for metric, ns in case["ns"].items():
+            old_ns = old["ns"].get(metric)
+            if not old_ns:
+                continue
+            ratio = ns / old_ns
+            flag = ""
+            if ratio > threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{case['name']:<40} {metric:<15} {old_ns:>14,} -> {ns:>14,} ns  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Scaling benchmark over synthetic envelopes.")
+    ap.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="results JSON to write")
+    ap.add_argument("--full", action="store_true", help="include 10^6-node graphs and a 64 MiB payload")
+    ap.add_argument("--filter", default=None, help="only run cases whose name contains this string")
+    ap.add_argument("--min-time", type=float, default=0.2, help="seconds to spend per metric (best call is kept)")
+    ap.add_argument("--max-repeat", type=int, default=1000)
+    ap.add_argument("--compare", default=None, metavar="BASE.json", help="print ratios against an earlier results file")
+    ap.add_argument("--threshold", type=float, default=1.25, help="with --compare: exit 1 if any ratio exceeds this")
+    args = ap.parse_args(argv)
+
+    with open(ANCHOR_PATH, "r", encoding="utf-8") as f:
+        anchors = json.load(f)
+
+    results: Dict[str, Any] = {
+        "suite_version": SUITE_VERSION,
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": [],
+    }
+    for shape, variant, nodes, payload in _cases(args.full):
+        name = _case_name(shape, variant, nodes, payload)
+        if args.filter and args.filter not in name:
+            continue
+        case = _run_case(shape, variant, nodes, payload, anchors, int(args.min_time * 1e9), args.max_repeat)
+        results["cases"].append(case)
+        cols = " ".join(f"{m}={ns / 1e3:,.1f}us" for m, ns in case["ns"].items())
+        print(f"{name:<40} {cols}", flush=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results: {args.output}")
+
+    if args.compare is not None:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        regressions = _compare(base, results, args.threshold)
+        print(f"regressions above x{args.threshold}: {regressions}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
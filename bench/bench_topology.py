@@ -0,0 +1,151 @@
+import os
+import sys
+import time
+import random
+import tracemalloc
+from typing import Dict, Any, List, Set, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from verifier import _build_graph, _check_topology  # noqa: E402
+
+
+# Previous topology gate (string adjacency dict, Kahn + separate DFS), kept as the baseline
+def _legacy_build_graph(tcc: Dict[str, Any]) -> Tuple[Dict[str, List[str]], Set[str]]:
+    adj: Dict[str, List[str]] = {}
+    nodeset: Set[str] = set()
+
+    for n in tcc.get("nodes", []):
+        nid = n.get("id")
+        if isinstance(nid, str) and nid:
+            nodeset.add(nid)
+            adj.setdefault(nid, [])
+
+    for e in tcc.get("edges", []):
+        a = e.get("from")
+        b = e.get("to")
+        if isinstance(a, str) and isinstance(b, str) and a and b:
+            adj.setdefault(a, []).append(b)
+            nodeset.add(a)
+            nodeset.add(b)
+
+    for n in nodeset:
+        adj.setdefault(n, [])
+
+    return adj, nodeset
+
+
+def _legacy_is_dag(adj: Dict[str, List[str]], nodes: Set[str]) -> bool:
+    indeg = {n: 0 for n in nodes}
+    for a, outs in adj.items():
+        for b in outs:
+            if b in indeg:
+                indeg[b] += 1
+            else:
+                indeg[b] = 1
+
+    queue = [n for n, d in indeg.items() if d == 0]
+    seen = 0
+
+    while queue:
+        x = queue.pop()
+        seen += 1
+        for y in adj.get(x, []):
+            indeg[y] -= 1
+            if indeg[y] == 0:
+                queue.append(y)
+
+    return seen == len(indeg)
+
+
+def _legacy_reachable(adj: Dict[str, List[str]], root: str, sink: str) -> bool:
+    stack = [root]
+    seen: Set[str] = set()
+
+    while stack:
+        x = stack.pop()
+        if x in seen:
+            continue
+        seen.add(x)
+        if x == sink:
+            return True
+        for y in adj.get(x, []):
+            stack.append(y)
+
+    return False
+
+
+def _make_tcc(n_edges: int, cyclic: bool, seed: int = 7) -> Dict[str, Any]:
+    # Random forward-edge DAG over n_edges / 4 nodes, with a chain n0 -> ... -> n{V-1}
+    rnd = random.Random(seed)
+    v = max(2, n_edges // 4)
+    edges = [{"from": f"n{i}", "to": f"n{i + 1}"} for i in range(v - 1)]
+    while len(edges) < n_edges:
+        a = rnd.randrange(v - 1)
+        b = rnd.randrange(a + 1, v)
+        edges.append({"from": f"n{a}", "to": f"n{b}"})
+    if cyclic:
+        edges.append({"from": "n2", "to": "n1"})
+    return {
+        "root": "n0",
+        "receipt": f"n{v - 1}",
+        "nodes": [{"id": f"n{i}", "type": "Step"} for i in range(v)],
+        "edges": edges,
+    }
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _graph_bytes(build, tcc: Dict[str, Any]) -> int:
+    # Traced allocation still held by the built graph
+    tracemalloc.start()
+    g = build(tcc)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del g
+    return held
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(
+        f"{'edges':>9} {'shape':>6} {'build_legacy_s':>15} {'build_csr_s':>12} "
+        f"{'check_legacy_s':>15} {'check_csr_s':>12} {'legacy_B/edge':>14} {'csr_B/edge':>11}"
+    )
+    for n_edges in (100_000, 1_000_000):
+        for cyclic in (False, True):
+            tcc = _make_tcc(n_edges, cyclic)
+            root, sink = tcc["root"], tcc["receipt"]
+            adj, nodes = _legacy_build_graph(tcc)
+            graph, _ = _build_graph(tcc)
+
+            def legacy():
+                return _legacy_is_dag(adj, nodes) and _legacy_reachable(adj, root, sink)
+
+            def fused():
+                is_dag, reachable = _check_topology(graph, root, sink)
+                return is_dag and reachable
+
+            assert legacy() == fused() == (not cyclic)
+            n = len(tcc["edges"])
+            print(
+                f"{n_edges:>9} {'cycle' if cyclic else 'dag':>6} "
+                f"{_best_of(lambda: _legacy_build_graph(tcc), repeat):>15.3f} "
+                f"{_best_of(lambda: _build_graph(tcc), repeat):>12.3f} "
+                f"{_best_of(legacy, repeat):>15.3f} "
+                f"{_best_of(fused, repeat):>12.3f} "
+                f"{_graph_bytes(_legacy_build_graph, tcc) / n:>14.1f} "
+                f"{_graph_bytes(lambda t: _build_graph(t)[0], tcc) / n:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import random
+import argparse
+from typing import Dict, Any, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from verifier import compute_witness_hash, _canonical_json_bytes  # noqa: E402
+
+ANCHOR_PATH = os.path.join(ROOT, "config", "current_anchors.json")
+
+# Graph shapes over node ids n0 (root, IntentAnchor) .. n{V-1} (receipt):
+#   chain       n0 -> n1 -> ... -> n{V-1}
+#   fan         n0 -> every middle node -> n{V-1} (one wide level)
+#   deep        chain backbone plus two random forward edges per node (deep DAG, ~3 edges/node)
+#   near_cycle  ladder of two chains cross-linked forward at every rung: many paths rejoin
+#               already finished nodes, so the walk keeps meeting "almost" back edges
+SHAPES = ("chain", "fan", "deep", "near_cycle")
+
+# Variants and the reason verify() must give for them:
+#   valid (OK), cycle (one back edge from the node feeding the receipt to n0), unreachable (receipt
+#   declared but disconnected), over_budget, bad_witness
+VARIANTS = ("valid", "cycle", "unreachable", "over_budget", "bad_witness")
+
+_DIGEST = "a" * 64
+
+
+def _edges(shape: str, v: int, rnd: random.Random) -> Tuple[List[Dict[str, str]], int]:
+    # (edges, index of a node with an edge into the receipt)
+    if shape == "chain":
+        return [{"from": f"n{i}", "to": f"n{i + 1}"} for i in range(v - 1)], v - 2
+    if shape == "fan":
+        mids = range(1, v - 1)
+        edges = [{"from": "n0", "to": f"n{i}"} for i in mids]
+        edges += [{"from": f"n{i}", "to": f"n{v - 1}"} for i in mids]
+        return edges, v - 2
+    if shape == "deep":
+        edges = [{"from": f"n{i}", "to": f"n{i + 1}"} for i in range(v - 1)]
+        for a in range(v - 2):
+            for _ in range(2):
+                edges.append({"from": f"n{a}", "to": f"n{rnd.randrange(a + 1, v)}"})
+        return edges, v - 2
+    if shape == "near_cycle":
+        # n0 -> rung 0; rung i = (n{2i+1}, n{2i+2}); both feed both nodes of rung i+1; last rung -> receipt
+        rungs = (v - 2) // 2
+        edges = [{"from": "n0", "to": "n1"}, {"from": "n0", "to": "n2"}]
+        for i in range(rungs - 1):
+            for a in (2 * i + 1, 2 * i + 2):
+                for b in (2 * i + 3, 2 * i + 4):
+                    edges.append({"from": f"n{a}", "to": f"n{b}"})
+        last = 2 * rungs
+        edges += [{"from": f"n{last - 1}", "to": f"n{v - 1}"}, {"from": f"n{last}", "to": f"n{v - 1}"}]
+        return edges, last
+    raise ValueError(f"unknown shape {shape!r}")
+
+
+def make_envelope(
+    shape: str,
+    nodes: int,
+    variant: str = "valid",
+    payload_bytes: int = 0,
+    seed: int = 0,
+    anchors: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    # Deterministic envelope for (shape, nodes, variant, payload_bytes, seed), witness filled in
+    if variant not in VARIANTS:
+        raise ValueError(f"unknown variant {variant!r}")
+    if anchors is None:
+        with open(ANCHOR_PATH, "r", encoding="utf-8") as f:
+            anchors = json.load(f)
+    rnd = random.Random(f"{shape}:{nodes}:{seed}")
+    v = max(nodes, 6)
+
+    node_list: List[Dict[str, Any]] = [{"id": f"n{i}", "type": "Step", "payload": {"i": i}} for i in range(v)]
+    node_list[0] = {
+        "id": "n0",
+        "type": "IntentAnchor",
+        "payload": {
+            "h_constitution": anchors["constitution_hash_current"],
+            "h_energy_policy": anchors["energy_policy_hash_current"],
+            "action_class": "EXTERNAL",
+        },
+    }
+    node_list[1] = {
+        "id": "n1",
+        "type": "GateVector",
+        "payload": {
+            "gate_outputs": [
+                {"gate_id": g, "output": 0}
+                for g in ("G_TOPO", "G_TARGETREF", "G_ANCHOR_CONST", "G_ANCHOR_ENERGY", "G_BUDGET")
+            ]
+        },
+    }
+    node_list[2] = {"id": "n2", "type": "TargetRef", "payload": {"target_digest": _DIGEST}}
+    node_list[v - 1] = {"id": f"n{v - 1}", "type": "ReceiptBCS", "payload": {"allow": True, "receipt_hash": "b" * 64}}
+    if payload_bytes:
+        node_list[3]["payload"]["blob"] = rnd.randbytes(payload_bytes // 2 + 1).hex()[:payload_bytes]
+
+    edges, tail = _edges(shape, v, rnd)
+    receipt = f"n{v - 1}"
+    if variant == "cycle":
+        edges.append({"from": f"n{tail}", "to": "n0"})
+    elif variant == "unreachable":
+        receipt = "orphan"
+        node_list.append({"id": "orphan", "type": "Step", "payload": {}})
+
+    budget = anchors["energy_budget_uj"]["EXTERNAL"]
+    env: Dict[str, Any] = {
+        "proposal_digest": _DIGEST,
+        "action_class": "EXTERNAL",
+        "energy_est_uj": budget + 1 if variant == "over_budget" else min(budget, 1000),
+        "tcc": {
+            "tcc_version": "v0.1",
+            "epoch": anchors.get("epoch", 1),
+            "nonce": seed,
+            "root": "n0",
+            "receipt": receipt,
+            "nodes": node_list,
+            "edges": edges,
+        },
+    }
+    env["witness_hash"] = "0" * 64 if variant == "bad_witness" else compute_witness_hash(env)
+    return env
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Write deterministic synthetic envelopes as canonical JSONL.")
+    ap.add_argument("--shape", choices=SHAPES, default="chain")
+    ap.add_argument("--nodes", type=int, default=1000)
+    ap.add_argument("--variant", choices=VARIANTS, default="valid")
+    ap.add_argument("--payload-bytes", type=int, default=0, help="pad one node payload with this many bytes")
+    ap.add_argument("--count", type=int, default=1, help="envelopes to write (seeds 0..count-1)")
+    ap.add_argument("-o", "--output", default="-", help="output file (- for stdout)")
+    args = ap.parse_args(argv)
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for seed in range(args.count):
+            env = make_envelope(args.shape, args.nodes, args.variant, args.payload_bytes, seed)
+            out.write(_canonical_json_bytes(env) + b"\n")
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import time
+import asyncio
+import argparse
+import statistics
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Load generator for src/http_server.py: C keep-alive connections, each keeping up to
+# `pipeline` requests in flight, N requests in total. Reports requests/sec and latency percentiles.
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _connection(host: str, port: int, request: bytes, count: int, pipeline: int, lat: List[int], errors: List[int]):
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at: "asyncio.Queue[int]" = asyncio.Queue(maxsize=pipeline)
+
+    async def send():
+        for _ in range(count):
+            await sent_at.put(time.perf_counter_ns())
+            writer.write(request)
+            await writer.drain()
+
+    async def receive():
+        for _ in range(count):
+            status = await _read_response(reader)
+            lat.append(time.perf_counter_ns() - await sent_at.get())
+            if status != 200:
+                errors.append(status)
+
+    await asyncio.gather(send(), receive())
+    writer.close()
+
+
+async def _run(args) -> None:
+    with open(args.envelope, "rb") as f:
+        body = f.read()
+    request = (
+        f"POST {args.path} HTTP/1.1\r\nHost: {args.host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode("ascii") + body
+
+    per_conn = [args.requests // args.connections] * args.connections
+    per_conn[0] += args.requests - sum(per_conn)
+    lat: List[int] = []
+    errors: List[int] = []
+    t0 = time.perf_counter()
+    await asyncio.gather(
+        *(_connection(args.host, args.port, request, n, args.pipeline, lat, errors) for n in per_conn)
+    )
+    elapsed = time.perf_counter() - t0
+
+    lat.sort()
+
+    def pct(p: float) -> float:
+        return lat[min(len(lat) - 1, int(len(lat) * p))] / 1e3
+
+    print(f"requests={len(lat)} connections={args.connections} pipeline={args.pipeline} errors={len(errors)}")
+    print(f"throughput={len(lat) / elapsed:,.0f} req/s elapsed={elapsed:.2f}s")
+    print(
+        f"latency_us p50={pct(0.50):.0f} p90={pct(0.90):.0f} p99={pct(0.99):.0f} "
+        f"max={lat[-1] / 1e3:.0f} mean={statistics.fmean(lat) / 1e3:.0f}"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load generator for the verifier HTTP endpoint.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--path", default="/verify")
+    ap.add_argument("--envelope", default=os.path.join(ROOT, "vectors", "invalid_targetref.json"))
+    ap.add_argument("-n", "--requests", type=int, default=20_000)
+    ap.add_argument("-c", "--connections", type=int, default=8)
+    ap.add_argument("-p", "--pipeline", type=int, default=1, help="requests in flight per connection")
+    asyncio.run(_run(ap.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
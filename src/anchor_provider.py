@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import collections
+from typing import Dict, Any, Optional, Tuple, Counter
+
+from verifier import compile_anchors, AnchorSnapshot
+
+# Default minimum time between two stat() calls on the anchors file
+DEFAULT_POLL_INTERVAL_S = 1.0
+
+
+def _stat_key(path: str) -> Tuple[int, int, int, int]:
+    st = os.stat(path)
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def load_anchors(path: str) -> AnchorSnapshot:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_anchors(json.load(f))
+
+
+class AnchorProvider:
+    # Hands out the current AnchorSnapshot for a long-lived verifier and hot-reloads it when
+    # current_anchors.json changes (device/inode/size/mtime polling, at most once per interval).
+    #
+    # Callers take one snapshot per envelope with current(), so a reload only ever takes effect
+    # between envelopes. A file that fails to load or compile is reported and the previous
+    # snapshot stays in service; it is retried once the file changes again (e.g. the rest of a
+    # non-atomic write lands). Replace the file with rename() to avoid the half-written case.
+
+    def __init__(self, path: str, poll_interval_s: Optional[float] = DEFAULT_POLL_INTERVAL_S):
+        # poll_interval_s=None loads once and never reloads. Startup errors are raised.
+        self.path = path
+        self.poll_interval_s = poll_interval_s
+        self._key = _stat_key(path)
+        self._snapshot = load_anchors(path)
+        self._next_poll = time.monotonic() + (poll_interval_s or 0.0)
+        self.generation = 1
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error: Optional[str] = None
+        self.verdicts_by_epoch: Counter = collections.Counter()
+
+    def current(self) -> AnchorSnapshot:
+        if self.poll_interval_s is not None:
+            now = time.monotonic()
+            if now >= self._next_poll:
+                self._next_poll = now + self.poll_interval_s
+                self._poll()
+        return self._snapshot
+
+    def _poll(self):
+        try:
+            key = _stat_key(self.path)
+        except OSError as e:
+            # Typically the gap between unlink and rename of an editor save; keep serving
+            self.last_error = f"stat failed: {e}"
+            return
+        if key == self._key:
+            return
+        self._key = key
+        try:
+            snapshot = load_anchors(self.path)
+        except (OSError, ValueError) as e:
+            self.reload_errors += 1
+            self.last_error = f"reload failed, keeping generation {self.generation}: {e}"
+            return
+        self._snapshot = snapshot
+        self.generation += 1
+        self.reloads += 1
+        self.last_error = None
+
+    def count(self, snapshot: AnchorSnapshot):
+        # Record one verdict made with `snapshot` (as returned by current())
+        self.verdicts_by_epoch[str(snapshot.epoch)] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "generation": self.generation,
+            "epoch": self._snapshot.epoch,
+            "fingerprint": self._snapshot.fingerprint(),
+            "reloads": self.reloads,
+            "reload_errors": self.reload_errors,
+            "last_error": self.last_error,
+            "verdicts_by_epoch": dict(sorted(self.verdicts_by_epoch.items())),
+        }
@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+from typing import Dict, Any, Optional, List
+
+from verifier import REASON, verify, parse_envelope, admit_bytes, deadline_budget, AnchorSnapshot
+from ledger import envelope_fields, ledger_row
+from verdict_cache import VerdictCache
+from anchor_provider import AnchorProvider, DEFAULT_POLL_INTERVAL_S
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANCHOR_PATH = os.path.join(ROOT, "config", "current_anchors.json")
+DEFAULT_SOCKET = os.path.join(ROOT, "out", "verifier.sock")
+
+# Frames are a 4-byte big-endian length followed by that many bytes:
+# requests carry one envelope (JSON), responses one verdict object (JSON).
+_HEADER_BYTES = 4
+MAX_FRAME_BYTES = 64 << 20
+
+
+def handle_envelope(
+    raw: bytes,
+    anchors: AnchorSnapshot,
+    source: Any = None,
+    cache: Optional[VerdictCache] = None,
+    deadline_ns: Optional[int] = None,
+) -> Dict[str, Any]:
+    # Verdict plus the RECEIPT/TOMBSTONE row run_vectors would write for this envelope, and the
+    # epoch of the anchors it was checked against.
+    # Unlike the demo vectors, "AUTO" witnesses are not filled in: they simply mismatch.
+    # deadline_ns: see verify(); json parsing itself is not interrupted, the gates after it are.
+    env = None
+    verdict = admit_bytes(raw, anchors)
+    if verdict is None:
+        try:
+            env = parse_envelope(raw)
+        except ValueError:
+            verdict = (False, REASON["SCHEMA"], {"stage": "schema", "detail": "invalid json"})
+        else:
+            check = verify if cache is None else cache.verify
+            verdict = check(env, anchors, deadline_ns=deadline_ns, bytes_admitted=True)
+    ok, reason, debug = verdict
+    row = ledger_row(source, envelope_fields(env), ok, reason, debug, int(time.time()))
+    return {"ok": ok, "reason": reason, "debug": debug, "row": row, "anchor_epoch": anchors.epoch}
+
+
+def _frame(obj: Dict[str, Any]) -> bytes:
+    body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    return len(body).to_bytes(_HEADER_BYTES, "big") + body
+
+
+async def _serve_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    provider: AnchorProvider,
+    cache: Optional[VerdictCache],
+    deadline_ms: float = 0,
+):
+    try:
+        while True:
+            try:
+                header = await reader.readexactly(_HEADER_BYTES)
+            except asyncio.IncompleteReadError:
+                break
+            n = int.from_bytes(header, "big")
+            if n > MAX_FRAME_BYTES:
+                # Fail closed and drop the connection: the stream cannot be resynchronized cheaply
+                debug = {"stage": "schema", "detail": f"frame of {n} bytes exceeds {MAX_FRAME_BYTES}"}
+                writer.write(_frame({"ok": False, "reason": REASON["SCHEMA"], "debug": debug, "row": None}))
+                await writer.drain()
+                break
+            raw = await reader.readexactly(n)
+            deadline_ns = deadline_budget(deadline_ms)
+            anchors = provider.current()
+            writer.write(_frame(handle_envelope(raw, anchors, source="uds", cache=cache, deadline_ns=deadline_ns)))
+            provider.count(anchors)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(
+    socket_path: str, provider: AnchorProvider, cache: Optional[VerdictCache] = None, deadline_ms: float = 0
+):
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = await asyncio.start_unix_server(
+        lambda r, w: _serve_connection(r, w, provider, cache, deadline_ms), path=socket_path, limit=MAX_FRAME_BYTES
+    )
+    print(f"Listening on {socket_path}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def request(socket_path: str, raw: bytes, sock: Optional[socket.socket] = None) -> Dict[str, Any]:
+    # Minimal blocking client: one envelope in, one verdict out. Pass an open socket to reuse it.
+    own = sock is None
+    if own:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    try:
+        sock.sendall(len(raw).to_bytes(_HEADER_BYTES, "big") + raw)
+        n = int.from_bytes(_recv_exactly(sock, _HEADER_BYTES), "big")
+        return json.loads(_recv_exactly(sock, n))
+    finally:
+        if own:
+            sock.close()
+
+
+def _recv_exactly(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("verifier daemon closed the connection")
+        buf += chunk
+    return bytes(buf)
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Resident PCC-Lite verifier on a Unix domain socket.")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET, help="socket path to listen on")
+    ap.add_argument("--anchors", default=ANCHOR_PATH, help="current_anchors.json (reloaded when it changes)")
+    ap.add_argument(
+        "--reload-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL_S,
+        help="seconds between checks of the anchors file for changes (0: load once)",
+    )
+    ap.add_argument("--cache-size", type=int, default=0, help="cache up to N verdicts of replayed envelopes (0: off)")
+    ap.add_argument(
+        "--deadline-ms",
+        type=float,
+        default=0,
+        help="fail an envelope closed (stage deadline) once this long after it was received (0: no deadline)",
+    )
+    args = ap.parse_args(argv)
+
+    provider = AnchorProvider(args.anchors, args.reload_interval if args.reload_interval > 0 else None)
+    os.makedirs(os.path.dirname(os.path.abspath(args.socket)), exist_ok=True)
+    cache = VerdictCache(args.cache_size) if args.cache_size > 0 else None
+    # Treat SIGTERM like Ctrl-C so the socket file is removed on a normal stop
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(serve(args.socket, provider, cache, args.deadline_ms))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        print(f"Anchors: {json.dumps(provider.stats())}")
+        if cache is not None:
+            print(f"Verdict cache: {json.dumps(cache.stats())}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
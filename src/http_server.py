@@ -0,0 +1,281 @@
+import re
+import sys
+import json
+import signal
+import asyncio
+import argparse
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+
+from anchor_provider import AnchorProvider, DEFAULT_POLL_INTERVAL_S
+from daemon import handle_envelope, MAX_FRAME_BYTES, ANCHOR_PATH
+from verifier import deadline_budget, json_bytes_depth, AnchorSnapshot
+from verdict_cache import VerdictCache
+
+
+# Stdlib-only HTTP/1.1 front end for the verifier:
+#   POST /verify        body: one envelope (JSON)                -> verdict object
+#   POST /verify/batch  body: JSON array or JSONL of envelopes   -> {"results": [verdict, ...]}
+#   GET  /healthz
+#   GET  /stats         anchors generation/epoch, verdicts per anchor epoch, verdict cache counters
+# A verify request may carry X-Verify-Deadline-Ms to override --deadline-ms (0: none); in a batch
+# each envelope gets that budget from when its own verification starts.
+# Connections are kept alive (HTTP/1.1 default) and pipelined requests are answered in order.
+
+MAX_BODY_BYTES = MAX_FRAME_BYTES
+MAX_HEADER_LINES = 100
+DEFAULT_MAX_CONNECTIONS = 256
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    501: "Not Implemented",
+    503: "Service Unavailable",
+}
+
+
+class _BadRequest(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _response(status: int, obj: Dict[str, Any], keep_alive: bool) -> bytes:
+    body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_STATUS_TEXT[status]}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    # (method, path, version, headers, body), or None on a clean end of stream
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, version = line.decode("latin-1").split()
+    except ValueError:
+        raise _BadRequest(400, "malformed request line")
+
+    headers: Dict[str, str] = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise _BadRequest(400, "malformed header")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise _BadRequest(400, "too many headers")
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise _BadRequest(501, "chunked request bodies are not supported")
+    body = b""
+    if "content-length" in headers:
+        try:
+            n = int(headers["content-length"])
+        except ValueError:
+            raise _BadRequest(400, "invalid Content-Length")
+        if n < 0:
+            raise _BadRequest(400, "invalid Content-Length")
+        if n > MAX_BODY_BYTES:
+            raise _BadRequest(413, f"body exceeds {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(n)
+    elif method == "POST":
+        raise _BadRequest(411, "Content-Length required")
+    return method, path, version, headers, body
+
+
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def _array_spans(text: str) -> Iterator[Tuple[int, int]]:
+    # (start, end) of each element of a JSON array text; raises ValueError if it is not one
+    i = _JSON_WS.match(text).end()
+    if text[i:i + 1] != "[":
+        raise ValueError("not an array")
+    i = _JSON_WS.match(text, i + 1).end()
+    if text[i:i + 1] != "]":
+        while True:
+            _, end = _DECODER.raw_decode(text, i)
+            yield i, end
+            i = _JSON_WS.match(text, end).end()
+            if text[i:i + 1] == "]":
+                break
+            if text[i:i + 1] != ",":
+                raise ValueError("expected , or ]")
+            i = _JSON_WS.match(text, i + 1).end()
+    if _JSON_WS.match(text, i + 1).end() != len(text):
+        raise ValueError("trailing data")
+
+
+def _batch_items(body: bytes, anchors: AnchorSnapshot) -> List[bytes]:
+    # A JSON array is cut into the original bytes of its elements, so canonical envelopes keep
+    # their witness digest fast path and the admission limits apply to what the client sent;
+    # JSONL keeps each line's raw bytes
+    if body.lstrip()[:1] != b"[":
+        return [line for line in body.splitlines() if line.strip()]
+    # The array adds one nesting level above its envelopes; check it before json recurses into it
+    max_depth = anchors.admission.max_depth
+    if max_depth is not None and json_bytes_depth(body) > max_depth + 1:
+        raise _BadRequest(400, f"batch nesting depth > max_depth={max_depth} + 1")
+    try:
+        text = body.decode("utf-8")
+        return [text[start:end].encode("utf-8") for start, end in _array_spans(text)]
+    except (ValueError, RecursionError):
+        raise _BadRequest(400, "invalid JSON array")
+
+
+def _deadline_ms(headers: Dict[str, str], default_ms: float) -> float:
+    value = headers.get("x-verify-deadline-ms")
+    if value is None:
+        return default_ms
+    try:
+        ms = float(value)
+    except ValueError:
+        raise _BadRequest(400, "invalid X-Verify-Deadline-Ms")
+    if not ms >= 0:
+        raise _BadRequest(400, "invalid X-Verify-Deadline-Ms")
+    return ms
+
+
+def _route(
+    method: str,
+    path: str,
+    body: bytes,
+    provider: AnchorProvider,
+    cache: Optional[VerdictCache],
+    deadline_ms: float = 0,
+) -> Tuple[int, Dict[str, Any]]:
+    if path in ("/verify", "/verify/batch"):
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        # One snapshot per request: a batch is never split across an anchors reload
+        anchors = provider.current()
+        if path == "/verify":
+            results = [handle_envelope(body, anchors, "http", cache, deadline_budget(deadline_ms))]
+        else:
+            results = [
+                handle_envelope(raw, anchors, "http", cache, deadline_budget(deadline_ms))
+                for raw in _batch_items(body, anchors)
+            ]
+        for _ in results:
+            provider.count(anchors)
+        return 200, results[0] if path == "/verify" else {"results": results}
+    if path == "/healthz":
+        return 200, {"ok": True}
+    if path == "/stats":
+        return 200, {"anchors": provider.stats(), "cache": cache.stats() if cache is not None else None}
+    return 404, {"error": "not found"}
+
+
+class VerifierHttpServer:
+    # Holds the anchor provider, optional verdict cache and the connection limit
+    def __init__(
+        self,
+        provider: AnchorProvider,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        cache: Optional[VerdictCache] = None,
+        deadline_ms: float = 0,
+    ):
+        self.provider = provider
+        self.cache = cache
+        self.deadline_ms = deadline_ms
+        self.max_connections = max_connections
+        self.connections = 0
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if self.connections >= self.max_connections:
+            writer.write(_response(503, {"error": "too many connections"}, keep_alive=False))
+            await writer.drain()
+            writer.close()
+            return
+
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    req = await _read_request(reader)
+                except _BadRequest as e:
+                    writer.write(_response(e.status, {"error": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if req is None:
+                    break
+                method, path, version, headers, body = req
+
+                conn = headers.get("connection", "").lower()
+                keep_alive = conn != "close" if version == "HTTP/1.1" else conn == "keep-alive"
+                try:
+                    deadline_ms = _deadline_ms(headers, self.deadline_ms)
+                    status, obj = _route(method, path.split("?", 1)[0], body, self.provider, self.cache, deadline_ms)
+                except _BadRequest as e:
+                    status, obj = e.status, {"error": str(e)}
+                writer.write(_response(status, obj, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            # Truncated stream or an over-long request/header line: just drop the connection
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+
+async def serve(
+    host: str,
+    port: int,
+    provider: AnchorProvider,
+    max_connections: int,
+    cache: Optional[VerdictCache] = None,
+    deadline_ms: float = 0,
+):
+    app = VerifierHttpServer(provider, max_connections, cache, deadline_ms)
+    server = await asyncio.start_server(app.handle_connection, host, port, limit=1 << 16)
+    print(f"Listening on http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Local HTTP/1.1 endpoint for the PCC-Lite verifier.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8787)
+    ap.add_argument("--anchors", default=ANCHOR_PATH, help="current_anchors.json (reloaded when it changes)")
+    ap.add_argument(
+        "--reload-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL_S,
+        help="seconds between checks of the anchors file for changes (0: load once)",
+    )
+    ap.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS)
+    ap.add_argument("--cache-size", type=int, default=0, help="cache up to N verdicts of replayed envelopes (0: off)")
+    ap.add_argument(
+        "--deadline-ms",
+        type=float,
+        default=0,
+        help="per-envelope time budget; late envelopes fail closed with stage deadline (0: no deadline)",
+    )
+    args = ap.parse_args(argv)
+
+    provider = AnchorProvider(args.anchors, args.reload_interval if args.reload_interval > 0 else None)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        cache = VerdictCache(args.cache_size) if args.cache_size > 0 else None
+        asyncio.run(serve(args.host, args.port, provider, args.max_connections, cache, args.deadline_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
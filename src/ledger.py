@@ -0,0 +1,406 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+from typing import Dict, Any, Optional, BinaryIO, List, Tuple
+
+# Write buffer per ledger file; rows reach the OS when it fills, or on flush()/fsync()/close()
+DEFAULT_BUFFER_BYTES = 1 << 20
+
+# Read size when a ledger file has to be hashed from disk
+_READ_CHUNK = 1 << 20
+
+
+# prev_hash of the first row in a chained ledger file
+GENESIS_HASH = "0" * 64
+
+
+def envelope_fields(env: Any) -> Dict[str, Any]:
+    # Envelope fields copied into ledger rows; tolerant of malformed envelopes (missing -> None)
+    env = env if isinstance(env, dict) else {}
+    tcc = env.get("tcc")
+    tcc = tcc if isinstance(tcc, dict) else {}
+    return {
+        "proposal_digest": env.get("proposal_digest"),
+        "action_class": env.get("action_class"),
+        "energy_est_uj": env.get("energy_est_uj"),
+        "epoch": tcc.get("epoch"),
+        "nonce": tcc.get("nonce"),
+    }
+
+
+def ledger_row(
+    source: Any, fields: Dict[str, Any], ok: bool, reason: str, debug: Dict[str, Any], ts: int
+) -> Dict[str, Any]:
+    # RECEIPT for a passing verdict, TOMBSTONE (with reason_code and failure stage) otherwise
+    row = {"kind": "RECEIPT" if ok else "TOMBSTONE", "ts": ts, "file": source}
+    row.update(fields)
+    row["allow"] = ok
+    row["reason_code"] = "OK" if ok else reason
+    if not ok:
+        row["failure_stage"] = debug.get("stage")
+        row["detail"] = debug.get("detail")
+    return row
+
+
+def encode_row(obj: Dict[str, Any]) -> bytes:
+    # One JSONL ledger line, exactly as the per-row appender wrote it (LF line ending)
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def chain_hash(prev_hash: str, row: Dict[str, Any]) -> str:
+    # chain_hash = SHA256(prev_hash (hex, ASCII) || canonical JSON of the row without
+    # its prev_hash / chain_hash fields)
+    body = json.dumps(row, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(prev_hash.encode("ascii") + body).hexdigest()
+
+
+def chain_row(row: Dict[str, Any], prev_hash: str) -> Dict[str, Any]:
+    out = dict(row)
+    out["prev_hash"] = prev_hash
+    out["chain_hash"] = chain_hash(prev_hash, row)
+    return out
+
+
+# Merkle tree over the rows of one ledger file, hashed as in RFC 6962 / RFC 9162:
+# leaf = SHA256(0x00 || row line without its LF), node = SHA256(0x01 || left || right),
+# and the root of an empty file is SHA256("").
+
+
+def merkle_leaf(line: bytes) -> bytes:
+    return hashlib.sha256(b"\x00" + line).digest()
+
+
+def _merkle_node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+class MerkleAccumulator:
+    # Streaming Merkle tree hash: keeps only the roots of the perfect subtrees seen so far
+    # (one per set bit of size), so appending a row is O(1) amortized and state is O(log n).
+    __slots__ = ("size", "_peaks")
+
+    def __init__(self):
+        self.size = 0
+        self._peaks: List[Tuple[int, bytes]] = []  # (height, subtree root), largest first
+
+    def add_leaf(self, leaf_hash: bytes):
+        self.size += 1
+        height, h = 0, leaf_hash
+        while self._peaks and self._peaks[-1][0] == height:
+            h = _merkle_node(self._peaks.pop()[1], h)
+            height += 1
+        self._peaks.append((height, h))
+
+    def root(self) -> bytes:
+        if not self._peaks:
+            return hashlib.sha256(b"").digest()
+        # Folding right to left reproduces the RFC 6962 split at the largest power of two
+        h = self._peaks[-1][1]
+        for _, left in reversed(self._peaks[:-1]):
+            h = _merkle_node(left, h)
+        return h
+
+
+def _strip_lf(line: bytes) -> bytes:
+    return line[:-1] if line.endswith(b"\n") else line
+
+
+def _proof_ranges(index: int, lo: int, hi: int) -> List[Tuple[int, int]]:
+    # Leaf ranges [lo, hi) whose subtree roots form the audit path of `index`, leaf side first
+    ranges: List[Tuple[int, int]] = []
+    while hi - lo > 1:
+        k = 1 << ((hi - lo - 1).bit_length() - 1)  # largest power of two < hi - lo
+        if index < lo + k:
+            ranges.append((lo + k, hi))
+            hi = lo + k
+        else:
+            ranges.append((lo, lo + k))
+            lo = lo + k
+    ranges.reverse()
+    return ranges
+
+
+def inclusion_proof(path: str, index: int, size: Optional[int] = None) -> Dict[str, Any]:
+    # Audit path for row `index` (0-based) in the tree over the first `size` rows of a ledger
+    # file (default: all rows), built in one streaming pass with O(log n) memory. The proof
+    # carries the row itself so it can be checked without the ledger.
+    if size is None:
+        size = 0
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+                size += chunk.count(b"\n")
+    if not 0 <= index < size:
+        raise IndexError(f"row {index} out of range for {size} rows")
+
+    ranges = _proof_ranges(index, 0, size)
+    starts = {lo: i for i, (lo, _) in enumerate(ranges)}
+    accs = [MerkleAccumulator() for _ in ranges]
+    acc: Optional[MerkleAccumulator] = None
+    total = MerkleAccumulator()
+    row = b""
+    with open(path, "rb") as f:
+        for i, line in enumerate(f):
+            if i == size:
+                break
+            line = _strip_lf(line)
+            leaf = merkle_leaf(line)
+            total.add_leaf(leaf)
+            if i == index:
+                row = line
+                acc = None
+                continue
+            if i in starts:
+                acc = accs[starts[i]]
+            if acc is not None:
+                acc.add_leaf(leaf)
+    if total.size != size:
+        raise IndexError(f"{path} has only {total.size} rows")
+
+    return {
+        "index": index,
+        "size": size,
+        "row": row.decode("utf-8"),
+        "path": [a.root().hex() for a in accs],
+        "root": total.root().hex(),
+    }
+
+
+def verify_inclusion(line: bytes, index: int, size: int, path: List[str], root: str) -> bool:
+    # RFC 9162 section 2.1.3.2: recompute the root from the leaf and its audit path
+    if not 0 <= index < size:
+        return False
+    fn, sn = index, size - 1
+    r = merkle_leaf(line)
+    for p_hex in path:
+        p = bytes.fromhex(p_hex)
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = _merkle_node(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = _merkle_node(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r.hex() == root
+
+
+class _JsonlFile:
+    # Append-only handle that is opened on first write, so a ledger with no rows leaves no file.
+    # Keeps a running sha256 and Merkle accumulator of the whole file: existing content is
+    # hashed once up front, every appended row as it is written. chain_head tracks the same rows.
+    __slots__ = ("path", "buffer_bytes", "sha", "merkle", "chain_head", "_f")
+
+    def __init__(self, path: str, buffer_bytes: int, chained: bool):
+        self.path = path
+        self.buffer_bytes = buffer_bytes
+        self.sha = hashlib.sha256()
+        self.merkle = MerkleAccumulator()
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    self.sha.update(line)
+                    self.merkle.add_leaf(merkle_leaf(_strip_lf(line)))
+        self.chain_head = GENESIS_HASH
+        self._f: Optional[BinaryIO] = None
+        if chained and self.merkle.size:
+            head = json.loads(_last_line(path)).get("chain_hash")
+            if not isinstance(head, str):
+                raise ValueError(f"{path}: last row has no chain_hash; cannot continue the chain")
+            self.chain_head = head
+
+    def write(self, data: bytes):
+        if self._f is None:
+            self._f = open(self.path, "ab", buffering=self.buffer_bytes)
+        self._f.write(data)
+        self.sha.update(data)
+        self.merkle.add_leaf(merkle_leaf(data[:-1]))
+
+    def flush(self):
+        if self._f is not None:
+            self._f.flush()
+
+    def fsync(self):
+        if self._f is not None:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+def _hash_file_into(h: Any, path: str):
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            h.update(chunk)
+
+
+def _last_line(path: str) -> bytes:
+    # Reads backwards from the end, so continuing a long chain does not re-read the file
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        while pos > 0:
+            step = min(_READ_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            i = buf.rstrip(b"\n").rfind(b"\n")
+            if i >= 0:
+                return buf.rstrip(b"\n")[i + 1:]
+        return buf.rstrip(b"\n")
+
+
+class LedgerWriter:
+    # Holds receipts.jsonl and tombstone.jsonl open for a whole run and batches rows through
+    # a write buffer instead of opening, appending and closing the file once per row.
+    # flush() hands buffered rows to the OS; fsync() also forces them to stable storage.
+    #
+    # chained=True adds prev_hash / chain_hash to every row (see chain_hash()), one chain per
+    # file, so a suffix of either file can be checked against the sealed chain head alone.
+
+    def __init__(
+        self,
+        receipts_path: str,
+        tombstone_path: str,
+        buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        chained: bool = False,
+    ):
+        self.chained = chained
+        self._receipts = _JsonlFile(receipts_path, buffer_bytes, chained)
+        self._tombstone = _JsonlFile(tombstone_path, buffer_bytes, chained)
+
+    def append_receipt(self, row: Dict[str, Any]):
+        self._append(self._receipts, row)
+
+    def append_tombstone(self, row: Dict[str, Any]):
+        self._append(self._tombstone, row)
+
+    def _append(self, target: _JsonlFile, row: Dict[str, Any]):
+        if self.chained:
+            row = chain_row(row, target.chain_head)
+            target.chain_head = row["chain_hash"]
+        target.write(encode_row(row))
+
+    def flush(self):
+        self._receipts.flush()
+        self._tombstone.flush()
+
+    def fsync(self):
+        self._receipts.fsync()
+        self._tombstone.fsync()
+
+    def close(self):
+        self._receipts.close()
+        self._tombstone.close()
+
+    def seal_digests(self) -> Dict[str, str]:
+        # Digests for LEDGER_SEAL, from the running hash states. File digests need no re-read;
+        # root_sha256 = SHA256(receipts + b"\n" + tombstone) cannot be composed from two
+        # finished sha256 states, so it continues a copy of the receipts state with the
+        # tombstone file streamed back in fixed-size chunks: every seal is O(tombstone size),
+        # chained or not.
+        self.flush()
+        root = self._receipts.sha.copy()
+        root.update(b"\n")
+        _hash_file_into(root, self._tombstone.path)
+        digests = {
+            "receipts_sha256": self._receipts.sha.hexdigest(),
+            "tombstone_sha256": self._tombstone.sha.hexdigest(),
+            "root_sha256": root.hexdigest(),
+            "receipts_rows": self._receipts.merkle.size,
+            "receipts_merkle_root": self._receipts.merkle.root().hex(),
+            "tombstone_rows": self._tombstone.merkle.size,
+            "tombstone_merkle_root": self._tombstone.merkle.root().hex(),
+        }
+        if self.chained:
+            # The heads themselves add nothing to that cost: they are kept as rows are written
+            digests["receipts_chain_head"] = self._receipts.chain_head
+            digests["tombstone_chain_head"] = self._tombstone.chain_head
+        return digests
+
+    def __enter__(self) -> "LedgerWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def verify_chain(path: str, offset: int = 0, prev_hash: Optional[str] = None) -> Dict[str, Any]:
+    # Checks the rows of a chained ledger file from byte offset `offset` (a row start) to the end,
+    # in time proportional to that suffix. The first checked row must link to prev_hash; by default
+    # that is GENESIS_HASH at offset 0, elsewhere the row's own prev_hash is taken as given.
+    # Compare the returned head with the sealed *_chain_head to tie the suffix to the seal.
+    expected_prev = prev_hash if prev_hash is not None else (GENESIS_HASH if offset == 0 else None)
+    head = expected_prev
+    rows = 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            row = json.loads(line)
+            p = row.pop("prev_hash", None)
+            c = row.pop("chain_hash", None)
+            if not isinstance(p, str) or (expected_prev is not None and p != expected_prev):
+                return {"ok": False, "rows": rows, "head": head, "detail": f"prev_hash mismatch at row +{rows}"}
+            if c != chain_hash(p, row):
+                return {"ok": False, "rows": rows, "head": head, "detail": f"chain_hash mismatch at row +{rows}"}
+            expected_prev = head = c
+            rows += 1
+    return {"ok": True, "rows": rows, "head": head, "detail": None}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Audit tools for the PCC-Lite ledger.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    vc = sub.add_parser("verify-chain", help="check a chained receipts/tombstone file (or a suffix of it)")
+    vc.add_argument("path")
+    vc.add_argument("--offset", type=int, default=0, help="byte offset of the first row to check")
+    vc.add_argument("--prev", default=None, help="chain_hash the first checked row must link to")
+    vc.add_argument("--head", default=None, help="expected final chain head, e.g. from ledger_seal.jsonl")
+
+    pr = sub.add_parser("prove", help="emit a Merkle inclusion proof for one row of a ledger file")
+    pr.add_argument("path")
+    pr.add_argument("index", type=int, help="0-based row number")
+    pr.add_argument("--size", type=int, default=None, help="prove against the first N rows (e.g. sealed *_rows)")
+
+    cp = sub.add_parser("check-proof", help="check an inclusion proof against a sealed Merkle root")
+    cp.add_argument("proof", help="proof JSON file, or - for stdin")
+    cp.add_argument("--root", required=True, help="*_merkle_root from ledger_seal.jsonl")
+    cp.add_argument("--size", type=int, default=None, help="*_rows from ledger_seal.jsonl")
+
+    args = ap.parse_args(argv)
+    if args.cmd == "prove":
+        print(json.dumps(inclusion_proof(args.path, args.index, args.size), ensure_ascii=False))
+        return 0
+    if args.cmd == "check-proof":
+        if args.proof == "-":
+            proof = json.load(sys.stdin)
+        else:
+            with open(args.proof, "r", encoding="utf-8") as f:
+                proof = json.load(f)
+        size = proof["size"] if args.size is None else args.size
+        ok = size == proof["size"] and verify_inclusion(
+            proof["row"].encode("utf-8"), proof["index"], size, proof["path"], args.root
+        )
+        print(json.dumps({"ok": ok, "index": proof["index"], "size": size}))
+        return 0 if ok else 1
+    if args.cmd == "verify-chain":
+        res = verify_chain(args.path, args.offset, args.prev)
+        if res["ok"] and args.head is not None and res["head"] != args.head:
+            res.update({"ok": False, "detail": "head does not match the expected chain head"})
+        print(json.dumps(res, ensure_ascii=False))
+        return 0 if res["ok"] else 1
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
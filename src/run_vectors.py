@@ -1,10 +1,32 @@
 import os
+import sys
 import json
 import time
-import hashlib
-from typing import Dict, Any
+import argparse
+import itertools
+import functools
+import contextlib
+import collections
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Dict, Any, Tuple, Optional, List, Iterator, Iterable, Callable, Deque, Counter, BinaryIO
 
-from verifier import verify, compute_witness_hash
+from verifier import (
+    REASON,
+    ALLOWED_ACTIONS,
+    verify,
+    parse_envelope,
+    admit_bytes,
+    compute_witness_hash,
+    compile_anchors,
+    gate_facts,
+    final_facts,
+    verify_facts,
+    TIMED_GATES,
+    AnchorSnapshot,
+    Verdict,
+)
+from anchor_provider import AnchorProvider
+from ledger import LedgerWriter, DEFAULT_BUFFER_BYTES, encode_row, envelope_fields, ledger_row
 
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -13,15 +35,11 @@ OUT_DIR = os.path.join(ROOT, "out")
 ANCHOR_PATH = os.path.join(ROOT, "config", "current_anchors.json")
 
 
-def _sha256_hex(b: bytes) -> str:
-    return hashlib.sha256(b).hexdigest()
-
-
 def _ensure_out():
     os.makedirs(OUT_DIR, exist_ok=True)
 
 
-def _load_anchors() -> Dict[str, Any]:
+def _read_anchors() -> Dict[str, Any]:
     with open(ANCHOR_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -31,101 +49,430 @@ def _append_jsonl(path: str, obj: Dict[str, Any]):
         f.write(json.dumps(obj, ensure_ascii=False) + "\n")
 
 
-def _read_bytes(p: str) -> bytes:
-    if not os.path.exists(p):
-        return b""
-    with open(p, "rb") as f:
-        return f.read()
-
-
-def _auto_fill_witness(env: Dict[str, Any]) -> Dict[str, Any]:
+def _auto_fill_witness(env: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+    # Also returns the digest when one was computed, so verify() does not hash the envelope again
     if env.get("witness_hash") == "AUTO":
         env_wo = dict(env)
         env_wo.pop("witness_hash", None)
-        env["witness_hash"] = compute_witness_hash(env_wo)
-    return env
+        digest = compute_witness_hash(env_wo)
+        env["witness_hash"] = digest
+        return env, digest
+    return env, None
+
+
+def _result(source: str, fields: Dict[str, Any], verdict: Verdict, facts: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # Verdict plus the envelope fields the ledger rows need (the envelope itself is not kept),
+    # and the envelope's gate facts when --facts-out asked for them
+    ok, reason, debug = verdict
+    res = {"file": source, "ok": ok, "reason": reason, "debug": debug, "fields": fields}
+    if facts is not None:
+        res["facts"] = facts
+    return res
+
+
+def _check(
+    source: str,
+    env: Any,
+    digest: Optional[str],
+    anchors: AnchorSnapshot,
+    with_facts: bool,
+    timings: bool,
+    reject_fast: bool,
+    bytes_admitted: bool = False,
+) -> Dict[str, Any]:
+    if not with_facts:
+        verdict = verify(
+            env,
+            anchors,
+            expected_witness=digest,
+            timings=timings,
+            reject_fast=reject_fast,
+            bytes_admitted=bytes_admitted,
+        )
+        return _result(source, envelope_fields(env), verdict, None)
+    facts = gate_facts(env, expected_witness=digest)
+    return _result(source, envelope_fields(env), verify_facts(facts, anchors), facts)
+
+
+def _verify_file(
+    fn: str, anchors: AnchorSnapshot, with_facts: bool = False, timings: bool = False, reject_fast: bool = False
+) -> Dict[str, Any]:
+    path = os.path.join(VEC_DIR, fn)
+    with open(path, "r", encoding="utf-8") as f:
+        env = json.load(f)
+
+    env, digest = _auto_fill_witness(env)
+    return _check(fn, env, digest, anchors, with_facts, timings, reject_fast)
+
+
+def _verify_line(
+    source: str,
+    raw: bytes,
+    anchors: AnchorSnapshot,
+    with_facts: bool = False,
+    timings: bool = False,
+    reject_fast: bool = False,
+) -> Dict[str, Any]:
+    # One JSONL envelope. With facts the line is parsed even when over the admission limits:
+    # those depend on the anchors, so its facts record the byte size and depth for
+    # verify_facts() to check instead.
+    t0 = time.perf_counter_ns() if timings else 0
+    if not with_facts:
+        inadmissible = admit_bytes(raw, anchors)
+        if inadmissible is not None:
+            return _result(source, envelope_fields(None), inadmissible, None)
+    try:
+        env = parse_envelope(raw)
+    except ValueError:
+        verdict = (False, REASON["SCHEMA"], {"stage": "schema", "detail": "invalid json"})
+        if not with_facts:
+            return _result(source, envelope_fields(None), verdict, None)
+        facts = final_facts(verdict, raw)
+        return _result(source, envelope_fields(None), verify_facts(facts, anchors), facts)
+
+    digest = None
+    if isinstance(env, dict):
+        env, digest = _auto_fill_witness(env)
+    if with_facts:
+        facts = gate_facts(env, expected_witness=digest, raw=raw)
+        return _result(source, envelope_fields(env), verify_facts(facts, anchors), facts)
+    t_parse = time.perf_counter_ns() - t0 if timings else 0
+    res = _check(source, env, digest, anchors, False, timings, reject_fast, bytes_admitted=True)
+    if timings:
+        res["debug"].setdefault("timings_ns", {})["parse"] = t_parse
+    return res
+
+
+def _reverify_line(source: str, raw: bytes, anchors: AnchorSnapshot) -> Dict[str, Any]:
+    # One --facts-out row re-evaluated against the current anchors; the envelope is not needed
+    try:
+        rec = json.loads(raw)
+        return _result(rec["file"], rec["fields"], verify_facts(rec["facts"], anchors), None)
+    except (ValueError, KeyError, TypeError) as e:
+        raise SystemExit(f"{source}: unusable gate facts row ({e})")
+
+
+def _iter_vector_files() -> Iterator[Tuple[str]]:
+    for fn in sorted([f for f in os.listdir(VEC_DIR) if f.endswith(".json")]):
+        yield (fn,)
+
+
+def _iter_jsonl(path: str) -> Iterator[Tuple[str, bytes]]:
+    # (source, raw line) per non-blank line, read lazily; source is "<name>:<line number>"
+    name = "stdin" if path == "-" else os.path.basename(path)
+    with contextlib.ExitStack() as stack:
+        f = sys.stdin.buffer if path == "-" else stack.enter_context(open(path, "rb"))
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip(b"\r\n")
+            if line.strip():
+                yield f"{name}:{lineno}", line
+
+
+# Per-process anchors for --workers mode (set by _init_worker)
+_worker_anchors: Optional[AnchorSnapshot] = None
+
+
+def _init_worker(raw_anchors: Dict[str, Any]):
+    global _worker_anchors
+    _worker_anchors = compile_anchors(raw_anchors)
+
+
+def _run_batch_in_worker(fn: Callable[..., Dict[str, Any]], items: List[Tuple]) -> List[Dict[str, Any]]:
+    return [fn(*item, _worker_anchors) for item in items]
+
+
+def _pool_map(
+    pool: ProcessPoolExecutor, fn: Callable[..., Dict[str, Any]], items: Iterable[Tuple], batch: int, window: int
+) -> Iterator[Dict[str, Any]]:
+    # fn(*item, anchors) for every item, in input order. Items are shipped in batches and at most
+    # `window` batches are in flight, so an unbounded input (e.g. stdin) is consumed lazily.
+    pending: Deque[Future] = collections.deque()
+    for chunk in _chunked(items, batch):
+        pending.append(pool.submit(_run_batch_in_worker, fn, chunk))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
 
 
-def main():
+def _chunked(items: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    it = iter(items)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _watch_anchors(
+    verify_item: Callable[..., Dict[str, Any]], items: Iterable[Tuple], provider: AnchorProvider
+) -> Iterator[Dict[str, Any]]:
+    # Single-process loop that picks up anchor changes between envelopes
+    for item in items:
+        anchors = provider.current()
+        res = verify_item(*item, anchors)
+        provider.count(anchors)
+        yield res
+
+
+class _TimingHistograms:
+    # --timings: per-gate perf_counter_ns() distributions over the run, in log2 buckets
+    # (bucket k holds durations in [2**(k-1), 2**k) ns), written to timings.json
+    def __init__(self):
+        self.gates: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, timings_ns: Dict[str, int]):
+        for gate, ns in timings_ns.items():
+            h = self.gates.get(gate)
+            if h is None:
+                h = self.gates[gate] = {
+                    "count": 0,
+                    "total_ns": 0,
+                    "min_ns": ns,
+                    "max_ns": ns,
+                    "buckets": collections.Counter(),
+                }
+            h["count"] += 1
+            h["total_ns"] += ns
+            h["min_ns"] = min(h["min_ns"], ns)
+            h["max_ns"] = max(h["max_ns"], ns)
+            h["buckets"][ns.bit_length()] += 1
+
+    @staticmethod
+    def _quantile(buckets: Counter, count: int, q: float) -> int:
+        # Upper bound of the bucket holding the q-quantile
+        seen = 0
+        for k in sorted(buckets):
+            seen += buckets[k]
+            if seen >= q * count:
+                return (1 << k) - 1
+        return 0
+
+    def to_json(self) -> Dict[str, Any]:
+        order = ("parse",) + TIMED_GATES
+        out: Dict[str, Any] = {"unit": "ns", "gates": {}}
+        for gate in sorted(self.gates, key=lambda g: (order.index(g) if g in order else len(order), g)):
+            h = self.gates[gate]
+            b = h["buckets"]
+            out["gates"][gate] = {
+                "count": h["count"],
+                "total_ns": h["total_ns"],
+                "mean_ns": h["total_ns"] // h["count"],
+                "min_ns": h["min_ns"],
+                "max_ns": h["max_ns"],
+                "p50_ns_le": self._quantile(b, h["count"], 0.50),
+                "p90_ns_le": self._quantile(b, h["count"], 0.90),
+                "p99_ns_le": self._quantile(b, h["count"], 0.99),
+                "histogram": [[(1 << k) - 1, b[k]] for k in sorted(b)],
+            }
+        return out
+
+
+class _Summary:
+    # summary.json contents. Counters per reason code, failure stage and action_class take
+    # constant memory; per-envelope rows are kept under "details" only in "full" mode, and
+    # can be streamed to a JSONL file instead.
+    def __init__(self, keep_details: bool, details_out: Optional[BinaryIO]):
+        self.ok = 0
+        self.fail = 0
+        self.by_reason: Counter = collections.Counter()
+        self.by_stage: Counter = collections.Counter()
+        self.by_action_class: Dict[Optional[str], Counter] = {}
+        self.details: Optional[List[Dict[str, Any]]] = [] if keep_details else None
+        self._details_out = details_out
+
+    def add(self, row: Dict[str, Any], action_class: Any):
+        if row["ok"]:
+            self.ok += 1
+        else:
+            self.fail += 1
+            self.by_stage[row["debug"].get("stage")] += 1
+        self.by_reason[row["reason"]] += 1
+        # Keys stay bounded on adversarial input: unknown classes share one bucket, a missing or
+        # non-string one is null
+        ac = action_class if isinstance(action_class, str) else None
+        if ac is not None and ac not in ALLOWED_ACTIONS:
+            ac = "invalid"
+        self.by_action_class.setdefault(ac, collections.Counter())["ok" if row["ok"] else "fail"] += 1
+
+        if self.details is not None:
+            self.details.append(row)
+        if self._details_out is not None:
+            self._details_out.write(encode_row(row))
+
+    def to_json(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "ok": self.ok,
+            "fail": self.fail,
+            "by_reason": dict(sorted(self.by_reason.items())),
+            "by_stage": dict(sorted(self.by_stage.items(), key=lambda kv: str(kv[0]))),
+            "by_action_class": {
+                k: dict(sorted(v.items())) for k, v in sorted(self.by_action_class.items(), key=lambda kv: str(kv[0]))
+            },
+        }
+        if self.details is not None:
+            out["details"] = self.details
+        return out
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Verify acceptance vectors and write the demo ledger.")
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="verify envelopes in N worker processes (output order and content are unchanged)",
+    )
+    ap.add_argument(
+        "--input",
+        default=None,
+        metavar="FILE.jsonl",
+        help="stream envelopes from a JSONL file (one per line, - for stdin) instead of vectors/",
+    )
+    ap.add_argument(
+        "--summary",
+        choices=("full", "counters"),
+        default="full",
+        help="full: summary.json also lists every envelope; counters: aggregate counts only (constant memory)",
+    )
+    ap.add_argument(
+        "--details-out",
+        default=None,
+        metavar="FILE.jsonl",
+        help="stream one detail row per envelope to this JSONL file",
+    )
+    ap.add_argument(
+        "--facts-out",
+        default=None,
+        metavar="FILE.jsonl",
+        help="also write each envelope's anchor-independent gate results, for --reverify-from",
+    )
+    ap.add_argument(
+        "--reverify-from",
+        default=None,
+        metavar="FILE.jsonl",
+        help="re-run only the anchor and budget gates over a --facts-out file against the current anchors",
+    )
+    ap.add_argument(
+        "--watch-anchors",
+        action="store_true",
+        help="reload current_anchors.json when it changes (single process); summary.json counts verdicts per epoch",
+    )
+    ap.add_argument(
+        "--timings",
+        action="store_true",
+        help="time every gate with perf_counter_ns and write per-gate histograms to out/timings.json",
+    )
+    ap.add_argument(
+        "--reject-fast",
+        action="store_true",
+        help="catch cheap topology failures before building the graph (same reason codes; details may differ)",
+    )
+    ap.add_argument(
+        "--chain",
+        action="store_true",
+        help="hash-chain receipt/tombstone rows (prev_hash, chain_hash) and seal the chain heads",
+    )
+    args = ap.parse_args(argv)
+    if args.workers < 1:
+        ap.error("--workers must be >= 1")
+    if args.reverify_from is not None and (args.input is not None or args.facts_out is not None):
+        ap.error("--reverify-from cannot be combined with --input or --facts-out")
+    if args.timings and (args.facts_out is not None or args.reverify_from is not None):
+        ap.error("--timings cannot be combined with --facts-out or --reverify-from")
+    if args.watch_anchors and args.workers > 1:
+        ap.error("--watch-anchors requires --workers 1")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    args = _parse_args(argv)
     _ensure_out()
-    anchors = _load_anchors()
+    raw_anchors = _read_anchors()
+    # Misconfigured anchors fail here, before any envelope is verified
+    anchors = compile_anchors(raw_anchors)
 
     receipts_path = os.path.join(OUT_DIR, "receipts.jsonl")
     tomb_path = os.path.join(OUT_DIR, "tombstone.jsonl")
     seal_path = os.path.join(OUT_DIR, "ledger_seal.jsonl")
     summary_path = os.path.join(OUT_DIR, "summary.json")
+    timings_path = os.path.join(OUT_DIR, "timings.json")
 
     # Clean previous outputs
-    for p in [receipts_path, tomb_path, seal_path, summary_path]:
+    for p in [receipts_path, tomb_path, seal_path, summary_path, timings_path]:
         if os.path.exists(p):
             os.remove(p)
 
-    files = sorted([f for f in os.listdir(VEC_DIR) if f.endswith(".json")])
-
-    summary = {"ok": 0, "fail": 0, "details": []}
-
-    for fn in files:
-        path = os.path.join(VEC_DIR, fn)
-        with open(path, "r", encoding="utf-8") as f:
-            env = json.load(f)
-
-        env = _auto_fill_witness(env)
-        ok, reason, debug = verify(env, anchors)
-
-        ts = int(time.time())
-        row = {"file": fn, "ok": ok, "reason": reason, "debug": debug}
-        summary["details"].append(row)
-
-        if ok:
-            receipt = {
-                "kind": "RECEIPT",
-                "ts": ts,
-                "file": fn,
-                "proposal_digest": env["proposal_digest"],
-                "action_class": env["action_class"],
-                "energy_est_uj": env["energy_est_uj"],
-                "epoch": env.get("tcc", {}).get("epoch"),
-                "nonce": env.get("tcc", {}).get("nonce"),
-                "allow": True,
-                "reason_code": "OK",
-            }
-            _append_jsonl(receipts_path, receipt)
-            summary["ok"] += 1
+    if args.reverify_from is not None:
+        verify_item, items = _reverify_line, _iter_jsonl(args.reverify_from)
+    elif args.input is not None:
+        verify_item, items = _verify_line, _iter_jsonl(args.input)
+    else:
+        verify_item, items = _verify_file, _iter_vector_files()
+    if args.facts_out is not None:
+        verify_item = functools.partial(verify_item, with_facts=True)
+    if args.reject_fast and args.reverify_from is None:
+        verify_item = functools.partial(verify_item, reject_fast=True)
+    histograms = None
+    if args.timings:
+        verify_item = functools.partial(verify_item, timings=True)
+        histograms = _TimingHistograms()
+
+    with contextlib.ExitStack() as stack:
+        ledger = stack.enter_context(LedgerWriter(receipts_path, tomb_path, chained=args.chain))
+        details_out = None
+        if args.details_out is not None:
+            details_out = stack.enter_context(open(args.details_out, "wb", buffering=DEFAULT_BUFFER_BYTES))
+        summary = _Summary(keep_details=args.summary == "full", details_out=details_out)
+        facts_out = None
+        if args.facts_out is not None:
+            facts_out = stack.enter_context(open(args.facts_out, "wb", buffering=DEFAULT_BUFFER_BYTES))
+        provider = None
+        if args.watch_anchors:
+            provider = AnchorProvider(ANCHOR_PATH)
+            results = _watch_anchors(verify_item, items, provider)
+        elif args.workers > 1:
+            pool = stack.enter_context(
+                ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(raw_anchors,))
+            )
+            results = _pool_map(pool, verify_item, items, batch=64, window=args.workers * 4)
         else:
-            tomb = {
-                "kind": "TOMBSTONE",
-                "ts": ts,
-                "file": fn,
-                "proposal_digest": env.get("proposal_digest"),
-                "action_class": env.get("action_class"),
-                "energy_est_uj": env.get("energy_est_uj"),
-                "epoch": env.get("tcc", {}).get("epoch"),
-                "nonce": env.get("tcc", {}).get("nonce"),
-                "allow": False,
-                "reason_code": reason,
-                "failure_stage": debug.get("stage"),
-                "detail": debug.get("detail"),
-            }
-            _append_jsonl(tomb_path, tomb)
-            summary["fail"] += 1
-
-    receipts_bytes = _read_bytes(receipts_path)
-    tomb_bytes = _read_bytes(tomb_path)
-
-    seal = {
-        "kind": "LEDGER_SEAL",
-        "ts": int(time.time()),
-        "receipts_sha256": _sha256_hex(receipts_bytes),
-        "tombstone_sha256": _sha256_hex(tomb_bytes),
-        "root_sha256": _sha256_hex(receipts_bytes + b"\n" + tomb_bytes),
-    }
+            results = (verify_item(*item, anchors) for item in items)
+
+        for res in results:
+            fn, ok, reason, debug = res["file"], res["ok"], res["reason"], res["debug"]
+            if histograms is not None:
+                # Kept out of summary.json and the ledger, which stay byte-identical without --timings
+                histograms.add(debug.pop("timings_ns", {}))
+
+            ts = int(time.time())
+            summary.add({"file": fn, "ok": ok, "reason": reason, "debug": debug}, res["fields"]["action_class"])
+
+            if facts_out is not None:
+                facts_out.write(encode_row({"file": fn, "fields": res["fields"], "facts": res["facts"]}))
+
+            row = ledger_row(fn, res["fields"], ok, reason, debug, ts)
+            if ok:
+                ledger.append_receipt(row)
+            else:
+                ledger.append_tombstone(row)
+
+    seal = {"kind": "LEDGER_SEAL", "ts": int(time.time())}
+    seal.update(ledger.seal_digests())
     _append_jsonl(seal_path, seal)
 
+    summary_json = summary.to_json()
+    if provider is not None:
+        summary_json["anchors"] = provider.stats()
     with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+        json.dump(summary_json, f, ensure_ascii=False, indent=2)
+
+    if histograms is not None:
+        with open(timings_path, "w", encoding="utf-8") as f:
+            json.dump(histograms.to_json(), f, ensure_ascii=False, indent=2)
 
     print("DONE.")
-    print(f"OK={summary['ok']} FAIL={summary['fail']}")
+    print(f"OK={summary.ok} FAIL={summary.fail}")
     print(f"Outputs: {OUT_DIR}")
 
 
@@ -0,0 +1,100 @@
+import collections
+from typing import Dict, Any, Tuple, Optional
+
+from verifier import (
+    verify,
+    compute_witness_hash,
+    deadline_verdict,
+    entry_verdict,
+    as_snapshot,
+    AnchorsLike,
+    AnchorSnapshot,
+    DeadlineExceeded,
+)
+
+Verdict = Tuple[bool, str, Dict[str, Any]]
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+class VerdictCache:
+    # LRU cache of verify() results keyed by (witness digest, anchors fingerprint).
+    #
+    # The schema and admission gates run first: an envelope they reject is never hashed.
+    # An entry is only used after the envelope's witness_hash has been recomputed and found
+    # to match: the digest then binds the whole envelope, so the cached verdict is exactly what
+    # verify() would return. Envelopes whose witness does not match are verified and never cached.
+    # The recomputed digest is handed to verify() on a miss, so a miss still hashes once.
+    # Verdicts that ran out of time (stage "deadline") say nothing about the envelope and are not cached.
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "collections.OrderedDict[Tuple[str, str], Verdict]" = collections.OrderedDict()
+        self._fp_snapshot: Optional[AnchorSnapshot] = None
+        self._fp = ""
+
+    def _fingerprint(self, snapshot: AnchorSnapshot) -> str:
+        if snapshot is not self._fp_snapshot:
+            self._fp_snapshot = snapshot
+            self._fp = snapshot.fingerprint()
+        return self._fp
+
+    def verify(
+        self,
+        env: Dict[str, Any],
+        anchors: AnchorsLike,
+        expected_witness: Optional[str] = None,
+        deadline_ns: Optional[int] = None,
+        bytes_admitted: bool = False,
+    ) -> Verdict:
+        # Same arguments as verify()
+        if not isinstance(env, dict) or not isinstance(env.get("witness_hash"), str):
+            return verify(env, anchors, expected_witness, deadline_ns=deadline_ns, bytes_admitted=bytes_admitted)
+
+        snapshot = as_snapshot(anchors)
+        try:
+            failure = entry_verdict(env, snapshot, deadline_ns, bytes_admitted)
+            if failure is not None:
+                return failure
+            if expected_witness is None:
+                env_wo = dict(env)
+                env_wo.pop("witness_hash", None)
+                expected_witness = compute_witness_hash(env_wo, deadline_ns)
+        except DeadlineExceeded:
+            return deadline_verdict()
+        if env["witness_hash"] != expected_witness:
+            return verify(env, snapshot, expected_witness, deadline_ns=deadline_ns, bytes_admitted=bytes_admitted)
+
+        key = (expected_witness, self._fingerprint(snapshot))
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            ok, reason, debug = cached
+            return ok, reason, dict(debug)
+
+        self.misses += 1
+        ok, reason, debug = verify(
+            env, snapshot, expected_witness, deadline_ns=deadline_ns, bytes_admitted=bytes_admitted
+        )
+        if debug.get("stage") == "deadline":
+            return ok, reason, debug
+        self._entries[key] = (ok, reason, dict(debug))
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return ok, reason, debug
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
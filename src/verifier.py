@@ -1,6 +1,13 @@
+import re
 import json
 import hashlib
-from typing import Dict, Any, Tuple, List, Set
+import operator
+import itertools
+from time import perf_counter_ns, monotonic_ns
+from array import array
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Dict, Any, Tuple, List, Set, Iterator, Iterable, Optional, NamedTuple, Union, Mapping, Callable
 
 # Frozen reason codes (must match spec/REASON_CODES.md)
 REASON = {
@@ -35,8 +42,113 @@ def _canonical_json_bytes(obj: Any) -> bytes:
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
 
-def compute_witness_hash(env_without_witness: Dict[str, Any]) -> str:
-    return _sha256_hex(_canonical_json_bytes(env_without_witness))
+# Encoded text is handed to the hash in chunks of roughly this many characters
+_HASH_CHUNK_CHARS = 1 << 16
+
+# Same settings as _canonical_json_bytes; encode() takes the C encoder for each call
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+# Lists longer than this that sit at most _STREAM_DEPTH levels deep (tcc nodes/edges) are
+# encoded this many elements per call; everything else is encoded in one call. This keeps
+# memory bounded by a slice, while each call still runs in the C encoder.
+_STREAM_SLICE = 256
+_STREAM_DEPTH = 2
+
+
+def _has_long_list(obj: Any, depth: int) -> bool:
+    if depth > _STREAM_DEPTH:
+        return False
+    if isinstance(obj, dict):
+        return any(_has_long_list(v, depth + 1) for v in obj.values())
+    return isinstance(obj, (list, tuple)) and len(obj) > _STREAM_SLICE
+
+
+def _iter_canonical_json_pieces(obj: Any, depth: int) -> Iterator[str]:
+    encode = _CANONICAL_ENCODER.encode
+    if isinstance(obj, dict) and all(isinstance(k, str) for k in obj) and _has_long_list(obj, depth):
+        sep = "{"
+        for k in sorted(obj):
+            yield sep + encode(k) + ":"
+            yield from _iter_canonical_json_pieces(obj[k], depth + 1)
+            sep = ","
+        yield "}"
+    elif isinstance(obj, (list, tuple)) and _has_long_list(obj, depth):
+        sep = "["
+        for i in range(0, len(obj), _STREAM_SLICE):
+            yield sep + encode(obj[i:i + _STREAM_SLICE])[1:-1]
+            sep = ","
+        yield "]"
+    else:
+        yield encode(obj)
+
+
+def _iter_canonical_json_bytes(obj: Any) -> Iterator[bytes]:
+    # Streaming form of _canonical_json_bytes: concatenating the chunks gives the same bytes,
+    # but only one chunk (or one nodes/edges element) is held in memory at a time
+    buf: List[str] = []
+    size = 0
+    for piece in _iter_canonical_json_pieces(obj, 0):
+        buf.append(piece)
+        size += len(piece)
+        if size >= _HASH_CHUNK_CHARS:
+            yield "".join(buf).encode("utf-8")
+            buf = []
+            size = 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+class DeadlineExceeded(Exception):
+    # Raised at a traversal checkpoint once the caller's deadline has passed; verify() turns it
+    # into a fail-closed verdict
+    pass
+
+
+# Deadline checkpoints: long loops read the clock once per _CHECKPOINT_STEPS iterations
+_CHECKPOINT_STEPS = 4096
+_CHECKPOINT_CHUNK = (None,) * _CHECKPOINT_STEPS
+_first = operator.itemgetter(0)
+
+
+def _deadline_chunks(deadline_ns: int) -> Iterator[Tuple[None, ...]]:
+    while True:
+        if monotonic_ns() > deadline_ns:
+            raise DeadlineExceeded()
+        yield _CHECKPOINT_CHUNK
+
+
+def _ticks(deadline_ns: Optional[int]) -> Iterator[None]:
+    # Endless iterator to drive a loop with; without a deadline it is a plain C-level repeat
+    if deadline_ns is None:
+        return itertools.repeat(None)
+    return itertools.chain.from_iterable(_deadline_chunks(deadline_ns))
+
+
+def _checked(items: Iterable[Any], deadline_ns: Optional[int]) -> Iterable[Any]:
+    # items itself without a deadline, else the same items with a clock check every _CHECKPOINT_STEPS
+    if deadline_ns is None:
+        return items
+    return map(_first, zip(items, _ticks(deadline_ns)))
+
+
+def compute_witness_hash(env_without_witness: Dict[str, Any], deadline_ns: Optional[int] = None) -> str:
+    # deadline_ns: time.monotonic_ns() value; raises DeadlineExceeded between chunks once it has passed
+    h = hashlib.sha256()
+    for chunk in _iter_canonical_json_bytes(env_without_witness):
+        if deadline_ns is not None and monotonic_ns() > deadline_ns:
+            raise DeadlineExceeded()
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def parse_envelope(raw: bytes) -> Any:
+    # json.loads with over-deep nesting reported as ValueError like any other invalid input.
+    # The witness digest is left to verify(): checking that the input is already canonical
+    # costs more than re-encoding the parsed envelope.
+    try:
+        return json.loads(str(raw, "utf-8"))
+    except RecursionError:
+        raise ValueError("JSON nested too deeply") from None
 
 
 def _basic_schema_ok(env: Dict[str, Any]) -> bool:
@@ -56,150 +168,627 @@ def _basic_schema_ok(env: Dict[str, Any]) -> bool:
         return False
 
 
-def _build_graph(tcc: Dict[str, Any]) -> Tuple[Dict[str, List[str]], Set[str]]:
-    adj: Dict[str, List[str]] = {}
-    nodeset: Set[str] = set()
+class _Graph(NamedTuple):
+    # Compressed sparse row form: node ids are interned to 0..V-1 once; the successors of
+    # node i are targets[offsets[i]:offsets[i + 1]]. About 4 bytes per edge.
+    ids: Dict[str, int]
+    offsets: array
+    targets: array
+
 
-    # Add declared nodes
-    for n in tcc.get("nodes", []):
+def _build_graph(
+    tcc: Dict[str, Any], deadline_ns: Optional[int] = None
+) -> Tuple[_Graph, Dict[str, List[Dict[str, Any]]]]:
+    ids: Dict[str, int] = {}
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+
+    # Intern declared nodes, indexing them by type in the same pass
+    for n in _checked(tcc.get("nodes", []), deadline_ns):
+        ntype = n.get("type")
+        if isinstance(ntype, str):
+            by_type.setdefault(ntype, []).append(n)
         nid = n.get("id")
-        if isinstance(nid, str) and nid:
-            nodeset.add(nid)
-            adj.setdefault(nid, [])
+        if isinstance(nid, str) and nid and nid not in ids:
+            ids[nid] = len(ids)
 
-    # Add edges and ensure nodes exist in set
-    for e in tcc.get("edges", []):
+    # Intern edge endpoints (undeclared ones become nodes too) into parallel src/dst arrays
+    src = array("I")
+    dst = array("I")
+    for e in _checked(tcc.get("edges", []), deadline_ns):
         a = e.get("from")
         b = e.get("to")
         if isinstance(a, str) and isinstance(b, str) and a and b:
-            adj.setdefault(a, []).append(b)
-            nodeset.add(a)
-            nodeset.add(b)
-
-    # Ensure all nodes in nodeset have adjacency list
-    for n in nodeset:
-        adj.setdefault(n, [])
-
-    return adj, nodeset
-
-
-def _is_dag(adj: Dict[str, List[str]], nodes: Set[str]) -> bool:
-    # Kahn topological sort
-    indeg = {n: 0 for n in nodes}
-    for a, outs in adj.items():
-        for b in outs:
-            if b in indeg:
-                indeg[b] += 1
+            ia = ids.get(a)
+            if ia is None:
+                ia = ids[a] = len(ids)
+            ib = ids.get(b)
+            if ib is None:
+                ib = ids[b] = len(ids)
+            src.append(ia)
+            dst.append(ib)
+
+    # Counting sort by source; keeps each node's successors in edge order
+    counts = array("I", bytes(4 * (len(ids) + 1)))
+    for ia in _checked(src, deadline_ns):
+        counts[ia + 1] += 1
+    offsets = array("I", itertools.accumulate(counts))
+    fill = array("I", offsets)
+    targets = array("I", bytes(4 * len(src)))
+    for ia, ib in _checked(zip(src, dst), deadline_ns):
+        targets[fill[ia]] = ib
+        fill[ia] += 1
+
+    return _Graph(ids, offsets, targets), by_type
+
+
+def _check_topology(g: _Graph, root: str, sink: str, deadline_ns: Optional[int] = None) -> Tuple[bool, bool]:
+    # One iterative DFS deciding (is_dag, sink reachable from root).
+    # The walk starts at root, so reachability is settled once root's subtree is done;
+    # the remaining nodes are only visited for cycle detection, which stops at the first back edge.
+    offsets, targets = g.offsets, g.targets
+    state = bytearray(len(g.ids))  # 0 = unseen, 1 = expanded (on the DFS path), 2 = finished
+    r = g.ids.get(root)
+    reachable = root == sink
+    ticks = _ticks(deadline_ns)
+
+    for start in _checked(itertools.chain(() if r is None else (r,), range(len(state))), deadline_ns):
+        if state[start]:
+            continue
+        stack = [start]
+        for _ in ticks:
+            if not stack:
+                break
+            x = stack[-1]
+            if not state[x]:
+                state[x] = 1
+                for y in targets[offsets[x]:offsets[x + 1]]:
+                    mark = state[y]
+                    if not mark:
+                        stack.append(y)
+                    elif mark == 1:
+                        return False, reachable
             else:
-                indeg[b] = 1
-
-    queue = [n for n, d in indeg.items() if d == 0]
-    seen = 0
-
-    while queue:
-        x = queue.pop()
-        seen += 1
-        for y in adj.get(x, []):
-            indeg[y] -= 1
-            if indeg[y] == 0:
-                queue.append(y)
-
-    return seen == len(indeg)
-
+                # Either x's subtree is done, or x is a stale duplicate of a finished node
+                stack.pop()
+                state[x] = 2
+        if start == r:
+            s = g.ids.get(sink)
+            reachable = s is not None and state[s] != 0
+
+    return True, reachable
+
+
+@dataclass(frozen=True, slots=True)
+class AdmissionLimits:
+    # Optional "admission" block of current_anchors.json; None = unlimited.
+    # Envelopes over a limit are rejected as schema_invalid (stage "admission") before any graph work.
+    max_envelope_bytes: Optional[int] = None  # raw input size (byte-level entry points only)
+    max_nodes: Optional[int] = None
+    max_edges: Optional[int] = None
+    max_depth: Optional[int] = None  # JSON nesting depth; the envelope object itself is depth 1
+
+
+@dataclass(frozen=True, slots=True)
+class AnchorSnapshot:
+    # Immutable view of current_anchors.json; build with compile_anchors()
+    constitution_hash_current: Any
+    energy_policy_hash_current: Any
+    energy_budget_uj: Any
+    epoch: Any = None
+    admission: AdmissionLimits = AdmissionLimits()
+
+    def fingerprint(self) -> str:
+        # SHA256 over every field, i.e. over everything a verdict can depend on besides the envelope
+        plain = {f.name: getattr(self, f.name) for f in fields(self)}
+        plain = {k: dict(v) if isinstance(v, Mapping) else v for k, v in plain.items()}
+        return _sha256_hex(json.dumps(plain, sort_keys=True, separators=(",", ":"), default=repr).encode("utf-8"))
+
+
+AnchorsLike = Union[AnchorSnapshot, Dict[str, Any]]
+
+Verdict = Tuple[bool, str, Dict[str, Any]]
+
+
+def compile_anchors(anchors: Dict[str, Any]) -> AnchorSnapshot:
+    # Validates an anchors dict once; raises ValueError on a misconfigured snapshot
+    if not isinstance(anchors, dict):
+        raise ValueError("anchors must be a JSON object")
+
+    for key in ("constitution_hash_current", "energy_policy_hash_current"):
+        v = anchors.get(key)
+        if not isinstance(v, str) or not v:
+            raise ValueError(f"anchors: invalid {key}")
+
+    budget_map = anchors.get("energy_budget_uj")
+    if not isinstance(budget_map, dict):
+        raise ValueError("anchors: energy_budget_uj must be an object")
+    for action in sorted(ALLOWED_ACTIONS):
+        budget = budget_map.get(action)
+        if not isinstance(budget, int) or isinstance(budget, bool) or budget < 0:
+            raise ValueError(f"anchors: invalid energy_budget_uj[{action}]")
+
+    epoch = anchors.get("epoch")
+    if epoch is not None and (not isinstance(epoch, int) or isinstance(epoch, bool)):
+        raise ValueError("anchors: invalid epoch")
+
+    admission = anchors.get("admission", {})
+    if not isinstance(admission, dict):
+        raise ValueError("anchors: admission must be an object")
+    known = {f.name for f in fields(AdmissionLimits)}
+    for key, limit in admission.items():
+        if key not in known:
+            raise ValueError(f"anchors: unknown admission limit {key}")
+        if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+            raise ValueError(f"anchors: invalid admission.{key}")
+
+    return AnchorSnapshot(
+        constitution_hash_current=anchors["constitution_hash_current"],
+        energy_policy_hash_current=anchors["energy_policy_hash_current"],
+        energy_budget_uj=MappingProxyType(dict(budget_map)),
+        epoch=epoch,
+        admission=AdmissionLimits(**admission),
+    )
+
+
+def as_snapshot(anchors: AnchorsLike) -> AnchorSnapshot:
+    # Raw dicts are taken as-is (unvalidated) so their problems still surface per envelope
+    if isinstance(anchors, AnchorSnapshot):
+        return anchors
+    return AnchorSnapshot(
+        constitution_hash_current=anchors.get("constitution_hash_current"),
+        energy_policy_hash_current=anchors.get("energy_policy_hash_current"),
+        energy_budget_uj=anchors.get("energy_budget_uj", {}),
+        epoch=anchors.get("epoch"),
+        admission=_lenient_admission(anchors.get("admission")),
+    )
+
+
+def _lenient_admission(admission: Any) -> AdmissionLimits:
+    # Raw-dict counterpart of compile_anchors' validation: unusable limits are ignored, not raised
+    if not isinstance(admission, dict):
+        return AdmissionLimits()
+    limits = {}
+    for f in fields(AdmissionLimits):
+        v = admission.get(f.name)
+        if isinstance(v, int) and not isinstance(v, bool) and v >= 1:
+            limits[f.name] = v
+    return AdmissionLimits(**limits)
+
+
+def verify(
+    env: Dict[str, Any],
+    anchors: AnchorsLike,
+    expected_witness: Optional[str] = None,
+    timings: bool = False,
+    reject_fast: bool = False,
+    deadline_ns: Optional[int] = None,
+    bytes_admitted: bool = False,
+) -> Tuple[bool, str, Dict[str, Any]]:
+    # Returns: (ok, reason_code or "OK", debug_info)
+    # anchors: an AnchorSnapshot from compile_anchors(), or the raw anchors dict
+    # expected_witness: compute_witness_hash(env without witness_hash), if the caller already has it
+    # timings: also put debug["timings_ns"] = {gate: perf_counter_ns() spent} for the gates that ran
+    # reject_fast: look for cheap topology failures before building the graph (see _topology_precheck);
+    #   same ok and reason_code, but debug["detail"] may name a different topology defect
+    # deadline_ns: time.monotonic_ns() by which to give up; the long loops check the clock every
+    #   _CHECKPOINT_STEPS steps and a late verdict fails closed as schema_invalid, stage "deadline"
+    # bytes_admitted: env was parsed from raw input that already passed admit_bytes() with these
+    #   anchors, so the max_depth walk over the parsed envelope is skipped
+    snapshot = as_snapshot(anchors)
+    if deadline_ns is not None:
+        return _verify_by_deadline(env, snapshot, expected_witness, timings, reject_fast, deadline_ns, bytes_admitted)
+    if not timings:
+        return _verify_snapshot(env, snapshot, expected_witness, None, reject_fast, None, bytes_admitted)
+
+    timer = _GateTimer()
+    ok, reason, debug = _verify_snapshot(env, snapshot, expected_witness, timer, reject_fast, None, bytes_admitted)
+    if not ok:
+        # The failing gate returned before its own lap
+        timer.lap(_STAGE_GATE.get(debug.get("stage"), "schema"))
+    debug = dict(debug)
+    debug["timings_ns"] = timer.laps
+    return ok, reason, debug
+
+
+def _verify_by_deadline(
+    env: Dict[str, Any],
+    anchors: AnchorSnapshot,
+    expected_witness: Optional[str],
+    timings: bool,
+    reject_fast: bool,
+    deadline_ns: int,
+    bytes_admitted: bool,
+) -> Verdict:
+    timer = _GateTimer() if timings else None
+    try:
+        if monotonic_ns() > deadline_ns:
+            raise DeadlineExceeded()
+        ok, reason, debug = _verify_snapshot(
+            env, anchors, expected_witness, timer, reject_fast, deadline_ns, bytes_admitted
+        )
+    except DeadlineExceeded:
+        ok, reason, debug = deadline_verdict()
+    if timer is not None:
+        if not ok:
+            timer.lap(_STAGE_GATE.get(debug.get("stage"), "schema"))
+        debug = dict(debug)
+        debug["timings_ns"] = timer.laps
+    return ok, reason, debug
+
+
+def deadline_budget(budget_ms: float) -> Optional[int]:
+    # deadline_ns for a verification allowed budget_ms from now; None (no deadline) for budget_ms <= 0
+    if budget_ms <= 0:
+        return None
+    return monotonic_ns() + int(budget_ms * 1_000_000)
+
+
+def deadline_verdict() -> Verdict:
+    # Fail-closed verdict for an envelope whose verification ran out of time
+    return False, REASON["SCHEMA"], {"stage": "deadline", "detail": "deadline exceeded"}
+
+
+def verify_many(
+    envs: Iterable[Dict[str, Any]], anchors: AnchorsLike
+) -> Iterator[Tuple[bool, str, Dict[str, Any]]]:
+    # Yields verify(env, anchors) for each envelope, in order. The anchors are compiled once; past
+    # that the cost per envelope is the same as verify() with an AnchorSnapshot.
+    snapshot = as_snapshot(anchors)
+    for env in envs:
+        yield _verify_snapshot(env, snapshot, None)
+
+
+# Timing buckets of verify(..., timings=True), keyed by debug["stage"] of a failure
+TIMED_GATES = (
+    "schema",
+    "admission",
+    "graph_build",
+    "topology",
+    "targetref",
+    "anchors",
+    "coverage",
+    "budget",
+    "witness",
+    "deadline",
+)
+_STAGE_GATE = {
+    "schema": "schema",
+    "admission": "admission",
+    "topology": "topology",
+    "targetref": "targetref",
+    "anchor": "anchors",
+    "anchor_const": "anchors",
+    "anchor_energy": "anchors",
+    "gatevector": "coverage",
+    "coverage": "coverage",
+    "budget": "budget",
+    "witness": "witness",
+    "deadline": "deadline",
+}
 
-def _reachable(adj: Dict[str, List[str]], root: str, sink: str) -> bool:
-    stack = [root]
-    seen: Set[str] = set()
 
-    while stack:
-        x = stack.pop()
-        if x in seen:
-            continue
-        seen.add(x)
-        if x == sink:
-            return True
-        for y in adj.get(x, []):
-            stack.append(y)
+class _GateTimer:
+    # Accumulates perf_counter_ns() laps; lap(gate) charges the time since the previous lap to gate
+    __slots__ = ("laps", "_t")
+
+    def __init__(self):
+        self.laps: Dict[str, int] = {}
+        self._t = perf_counter_ns()
+
+    def lap(self, gate: str):
+        now = perf_counter_ns()
+        self.laps[gate] = self.laps.get(gate, 0) + now - self._t
+        self._t = now
+
+
+def _verify_snapshot(
+    env: Dict[str, Any],
+    anchors: AnchorSnapshot,
+    expected_witness: Optional[str],
+    timer: Optional[_GateTimer] = None,
+    reject_fast: bool = False,
+    deadline_ns: Optional[int] = None,
+    bytes_admitted: bool = False,
+) -> Verdict:
+    s = _structural_gates(env, timer, reject_fast, anchors.admission, deadline_ns, bytes_admitted)
+    if s.failure is not None:
+        return s.failure
+
+    if timer is None:
+        failure = (
+            _anchor_gates(s.anchor_payload, anchors)
+            or _coverage_gates(s.by_type, deadline_ns)
+            or _budget_gate(env["action_class"], env["energy_est_uj"], anchors)
+            or _witness_gate(env, expected_witness, deadline_ns)
+        )
+        return failure or (True, "OK", {"stage": "ok"})
+
+    checks = (
+        ("anchors", lambda: _anchor_gates(s.anchor_payload, anchors)),
+        ("coverage", lambda: _coverage_gates(s.by_type, deadline_ns)),
+        ("budget", lambda: _budget_gate(env["action_class"], env["energy_est_uj"], anchors)),
+        ("witness", lambda: _witness_gate(env, expected_witness, deadline_ns)),
+    )
+    for gate, check in checks:
+        failure = check()
+        timer.lap(gate)
+        if failure is not None:
+            return failure
+    return True, "OK", {"stage": "ok"}
 
-    return False
 
+class _Structure(NamedTuple):
+    # Outcome of the gates before the anchor gates: a failure verdict, or what the later gates need
+    failure: Optional[Verdict]
+    anchor_payload: Dict[str, Any]
+    by_type: Dict[str, List[Dict[str, Any]]]
 
-def _find_nodes_by_type(tcc: Dict[str, Any], node_type: str) -> List[Dict[str, Any]]:
-    return [n for n in tcc.get("nodes", []) if n.get("type") == node_type]
 
+def _entry_gates(
+    env: Dict[str, Any],
+    timer: Optional[_GateTimer] = None,
+    limits: AdmissionLimits = AdmissionLimits(),
+    deadline_ns: Optional[int] = None,
+    bytes_admitted: bool = False,
+) -> Optional[Verdict]:
+    # Schema and admission: the gates ranked above all others, none of which builds the graph
+    def fail(debug: Dict[str, Any]) -> Verdict:
+        return False, REASON["SCHEMA"], debug
 
-def verify(env: Dict[str, Any], anchors: Dict[str, Any]) -> Tuple[bool, str, Dict[str, Any]]:
-    # Returns: (ok, reason_code or "OK", debug_info)
     if not _basic_schema_ok(env):
-        return False, REASON["SCHEMA"], {"stage": "schema"}
+        return fail({"stage": "schema"})
 
     proposal_digest = env.get("proposal_digest")
     action_class = env.get("action_class")
     energy_est_uj = env.get("energy_est_uj")
     tcc = env.get("tcc")
-    witness_hash = env.get("witness_hash")
 
     if not isinstance(proposal_digest, str) or not proposal_digest:
-        return False, REASON["SCHEMA"], {"stage": "schema", "detail": "invalid proposal_digest"}
+        return fail({"stage": "schema", "detail": "invalid proposal_digest"})
 
-    if action_class not in ALLOWED_ACTIONS:
-        return False, REASON["SCHEMA"], {"stage": "schema", "detail": "invalid action_class"}
+    if not isinstance(action_class, str) or action_class not in ALLOWED_ACTIONS:
+        return fail({"stage": "schema", "detail": "invalid action_class"})
 
     if not isinstance(energy_est_uj, int) or energy_est_uj < 0:
-        return False, REASON["SCHEMA"], {"stage": "schema", "detail": "invalid energy_est_uj"}
+        return fail({"stage": "schema", "detail": "invalid energy_est_uj"})
 
     if not isinstance(tcc, dict):
-        return False, REASON["SCHEMA"], {"stage": "schema", "detail": "tcc not dict"}
+        return fail({"stage": "schema", "detail": "tcc not dict"})
+
+    # Every later gate reads nodes and edges as objects; checked here (in C) so no gate can raise
+    # on them and reject_fast cannot turn a schema failure into a topology one
+    for key in ("nodes", "edges"):
+        items = tcc[key]
+        if not isinstance(items, list) or not all(map(isinstance, items, itertools.repeat(dict))):
+            return fail({"stage": "schema", "detail": f"{key} not a list of objects"})
+    if timer:
+        timer.lap("schema")
+
+    # 0) Admission limits, before any graph work
+    failure = _admission_gate(env, tcc, limits, deadline_ns, bytes_admitted)
+    if failure is not None:
+        return failure
+    if timer:
+        timer.lap("admission")
+    return None
+
+
+def entry_verdict(
+    env: Dict[str, Any], anchors: AnchorsLike, deadline_ns: Optional[int] = None, bytes_admitted: bool = False
+) -> Optional[Verdict]:
+    # verify()'s verdict when the schema or admission gates already decide it, else None. These
+    # outrank every other gate and build no graph, so callers can run them before costlier work.
+    # Raises DeadlineExceeded (only the admission depth walk checks the clock).
+    return _entry_gates(env, None, as_snapshot(anchors).admission, deadline_ns, bytes_admitted)
+
+
+def _structural_gates(
+    env: Dict[str, Any],
+    timer: Optional[_GateTimer] = None,
+    reject_fast: bool = False,
+    limits: AdmissionLimits = AdmissionLimits(),
+    deadline_ns: Optional[int] = None,
+    bytes_admitted: bool = False,
+) -> _Structure:
+    # Schema, admission, topology, TargetRef and IntentAnchor count; of these only admission
+    # depends on the anchors config (its limits)
+    def fail(reason: str, debug: Dict[str, Any]) -> _Structure:
+        return _Structure((False, REASON[reason], debug), {}, {})
+
+    failure = _entry_gates(env, timer, limits, deadline_ns, bytes_admitted)
+    if failure is not None:
+        return _Structure(failure, {}, {})
+    proposal_digest = env["proposal_digest"]
+    tcc = env["tcc"]
 
     # 1) Topology Gate
-    adj, nodeset = _build_graph(tcc)
+    if reject_fast:
+        root = tcc.get("root")
+        receipt = tcc.get("receipt")
+        if isinstance(root, str) and isinstance(receipt, str) and root and receipt:
+            defect = _topology_precheck(tcc, root, receipt, deadline_ns)
+            if defect is not None:
+                return fail("TOPO", {"stage": "topology", "detail": defect})
+
+    graph, by_type = _build_graph(tcc, deadline_ns)
+    if timer:
+        timer.lap("graph_build")
     root = tcc.get("root")
     receipt = tcc.get("receipt")
 
     if not isinstance(root, str) or not isinstance(receipt, str) or not root or not receipt:
-        return False, REASON["TOPO"], {"stage": "topology", "detail": "missing root/receipt"}
+        return fail("TOPO", {"stage": "topology", "detail": "missing root/receipt"})
 
-    if not _is_dag(adj, nodeset):
-        return False, REASON["TOPO"], {"stage": "topology", "detail": "not a DAG"}
+    is_dag, reachable = _check_topology(graph, root, receipt, deadline_ns)
+    if not is_dag:
+        return fail("TOPO", {"stage": "topology", "detail": "not a DAG"})
 
-    if not _reachable(adj, root, receipt):
-        return False, REASON["TOPO"], {"stage": "topology", "detail": "receipt not reachable from root"}
+    if not reachable:
+        return fail("TOPO", {"stage": "topology", "detail": "receipt not reachable from root"})
+    if timer:
+        timer.lap("topology")
 
     # 2) TargetRef Gate
-    tnodes = _find_nodes_by_type(tcc, "TargetRef")
+    tnodes = by_type.get("TargetRef", [])
     if len(tnodes) != 1:
-        return False, REASON["TARGET"], {"stage": "targetref", "detail": f"TargetRef count={len(tnodes)}"}
+        return fail("TARGET", {"stage": "targetref", "detail": f"TargetRef count={len(tnodes)}"})
 
-    td = tnodes[0].get("payload", {}).get("target_digest")
+    td = _payload(tnodes[0]).get("target_digest")
     if td != proposal_digest:
-        return False, REASON["TARGET"], {"stage": "targetref", "detail": "target_digest != proposal_digest"}
+        return fail("TARGET", {"stage": "targetref", "detail": "target_digest != proposal_digest"})
+    if timer:
+        timer.lap("targetref")
 
-    # 3) Two Anchors Gate
-    anodes = _find_nodes_by_type(tcc, "IntentAnchor")
+    # 3) Two Anchors Gate (count only; the hashes are compared in _anchor_gates)
+    anodes = by_type.get("IntentAnchor", [])
     if len(anodes) != 1:
-        return False, REASON["SCHEMA"], {"stage": "anchor", "detail": f"IntentAnchor count={len(anodes)}"}
-
-    payloadA = anodes[0].get("payload", {})
+        return fail("SCHEMA", {"stage": "anchor", "detail": f"IntentAnchor count={len(anodes)}"})
+
+    return _Structure(None, _payload(anodes[0]), by_type)
+
+
+def _list_len(v: Any) -> int:
+    return len(v) if isinstance(v, list) else 0
+
+
+def _json_depth(obj: Any, limit: Optional[int] = None, deadline_ns: Optional[int] = None) -> int:
+    # Nesting depth of a parsed JSON value (a scalar is 0, {} or [] is 1); stops early and
+    # returns limit + 1 once the depth is known to exceed limit
+    depth = 0
+    stack = [(obj, 1)] if isinstance(obj, (dict, list)) else []
+    for _ in _ticks(deadline_ns):
+        if not stack:
+            break
+        o, d = stack.pop()
+        if d > depth:
+            depth = d
+            if limit is not None and depth > limit:
+                return limit + 1
+        for c in o.values() if isinstance(o, dict) else o:
+            if isinstance(c, (dict, list)):
+                stack.append((c, d + 1))
+    return depth
+
+
+def _inadmissible(detail: str) -> Verdict:
+    return False, REASON["SCHEMA"], {"stage": "admission", "detail": detail}
+
+
+def _over_limits(nodes: int, edges: int, depth: Callable[[int], int], limits: AdmissionLimits) -> Optional[Verdict]:
+    # depth(limit) is only called when a depth limit is set
+    if limits.max_nodes is not None and nodes > limits.max_nodes:
+        return _inadmissible(f"nodes={nodes} > max_nodes={limits.max_nodes}")
+    if limits.max_edges is not None and edges > limits.max_edges:
+        return _inadmissible(f"edges={edges} > max_edges={limits.max_edges}")
+    if limits.max_depth is not None and depth(limits.max_depth) > limits.max_depth:
+        return _inadmissible(f"nesting depth > max_depth={limits.max_depth}")
+    return None
+
+
+def _admission_gate(
+    env: Dict[str, Any],
+    tcc: Dict[str, Any],
+    limits: AdmissionLimits,
+    deadline_ns: Optional[int] = None,
+    bytes_admitted: bool = False,
+) -> Optional[Verdict]:
+    # O(1) count checks; the depth check walks the envelope, but only when max_depth is set and
+    # admit_bytes() has not already checked the raw input
+    check_depth = limits.max_depth is not None and not bytes_admitted
+    if limits.max_nodes is None and limits.max_edges is None and not check_depth:
+        return None
+    return _over_limits(
+        _list_len(tcc.get("nodes")),
+        _list_len(tcc.get("edges")),
+        (lambda limit: _json_depth(env, limit, deadline_ns)) if check_depth else (lambda limit: 0),
+        limits,
+    )
+
+
+# Strings are dropped before counting brackets; what remains of a JSON text is only structure
+_JSON_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_NON_BRACKETS = bytes(b for b in range(256) if b not in b"[]{}")
+_BRACKET_STEP = bytes.maketrans(b"[{]}", b"\x01\x01\xff\xff")
+
+
+def json_bytes_depth(raw: bytes) -> int:
+    # Nesting depth of a JSON text without parsing it (running sum of +1/-1 per bracket, in C)
+    steps = _JSON_STRING.sub(b"", raw).translate(_BRACKET_STEP, _NON_BRACKETS)
+    return max(itertools.accumulate(array("b", steps)), default=0)
+
+
+def admit_bytes(raw: bytes, anchors: AnchorsLike) -> Optional[Verdict]:
+    # Admission limits that can be checked on the raw input, before it is parsed: size in O(1)
+    # and nesting depth in one C-speed pass (json.loads itself recurses per nesting level).
+    # Returns the schema_invalid verdict for an inadmissible envelope, else None.
+    return _raw_over_limits(len(raw), lambda: json_bytes_depth(raw), as_snapshot(anchors).admission)
+
+
+def _raw_over_limits(size: int, depth: Callable[[], int], limits: AdmissionLimits) -> Optional[Verdict]:
+    # admit_bytes() on the raw input's byte size and depth(), which is only called when a depth limit is set
+    if limits.max_envelope_bytes is not None and size > limits.max_envelope_bytes:
+        return _inadmissible(f"bytes={size} > max_envelope_bytes={limits.max_envelope_bytes}")
+    if limits.max_depth is not None and depth() > limits.max_depth:
+        return _inadmissible(f"nesting depth > max_depth={limits.max_depth}")
+    return None
+
+
+def _topology_precheck(
+    tcc: Dict[str, Any], root: str, receipt: str, deadline_ns: Optional[int] = None
+) -> Optional[str]:
+    # Sufficient conditions for a topology failure, from one pass over the raw edge list and
+    # without building the graph: a self-loop, a root with no out-edge or a receipt with no
+    # in-edge (root != receipt). Only schema ranks above topology and schema has already passed,
+    # so such a failure decides the reason_code; the full walk might have named another defect
+    # first, e.g. "not a DAG" for an unreachable receipt in a cyclic graph.
+    root_out = receipt_in = root == receipt
+    for e in _checked(tcc.get("edges", []), deadline_ns):
+        a = e.get("from")
+        b = e.get("to")
+        if isinstance(a, str) and isinstance(b, str) and a and b:
+            if a == b:
+                return "not a DAG"
+            if a == root:
+                root_out = True
+            if b == receipt:
+                receipt_in = True
+    if not (root_out and receipt_in):
+        return "receipt not reachable from root"
+    return None
+
+
+def _anchor_gates(payloadA: Dict[str, Any], anchors: AnchorSnapshot) -> Optional[Verdict]:
     hc = payloadA.get("h_constitution")
     he = payloadA.get("h_energy_policy")
 
-    if hc != anchors.get("constitution_hash_current"):
+    if hc != anchors.constitution_hash_current:
         return False, REASON["ANCHOR_C"], {"stage": "anchor_const", "detail": "h_constitution mismatch"}
 
-    if he != anchors.get("energy_policy_hash_current"):
+    if he != anchors.energy_policy_hash_current:
         return False, REASON["ANCHOR_E"], {"stage": "anchor_energy", "detail": "h_energy_policy mismatch"}
+    return None
 
+
+def _payload(node: Dict[str, Any]) -> Dict[str, Any]:
+    # A node's payload object; a missing or non-object payload reads as empty
+    payload = node.get("payload")
+    return payload if isinstance(payload, dict) else {}
+
+
+def _coverage_gates(
+    by_type: Dict[str, List[Dict[str, Any]]], deadline_ns: Optional[int] = None
+) -> Optional[Verdict]:
     # 4) Minimal GateVector Coverage
-    gnodes = _find_nodes_by_type(tcc, "GateVector")
+    gnodes = by_type.get("GateVector", [])
     if len(gnodes) != 1:
         return False, REASON["SCHEMA"], {"stage": "gatevector", "detail": f"GateVector count={len(gnodes)}"}
 
-    gate_outputs = gnodes[0].get("payload", {}).get("gate_outputs", [])
+    gate_outputs = _payload(gnodes[0]).get("gate_outputs", [])
     if not isinstance(gate_outputs, list):
         return False, REASON["SCHEMA"], {"stage": "gatevector", "detail": "gate_outputs not list"}
 
     passed: Set[str] = set()
-    for it in gate_outputs:
+    for it in _checked(gate_outputs, deadline_ns):
         if not isinstance(it, dict):
             continue
         gid = it.get("gate_id")
@@ -210,20 +799,133 @@ def verify(env: Dict[str, Any], anchors: Dict[str, Any]) -> Tuple[bool, str, Dic
     if not REQ_GATES_MIN.issubset(passed):
         missing = sorted(list(REQ_GATES_MIN - passed))
         return False, REASON["COVER"], {"stage": "coverage", "detail": f"missing={missing}"}
+    return None
 
+
+def _budget_gate(action_class: str, energy_est_uj: int, anchors: AnchorSnapshot) -> Optional[Verdict]:
     # 5) Budget Gate (demo)
-    budget_map = anchors.get("energy_budget_uj", {})
-    budget = budget_map.get(action_class)
+    budget = anchors.energy_budget_uj.get(action_class)
     if not isinstance(budget, int):
         return False, REASON["SCHEMA"], {"stage": "budget", "detail": "missing budget"}
     if energy_est_uj > budget:
         return False, REASON["BUDGET"], {"stage": "budget", "detail": f"est={energy_est_uj} > budget={budget}"}
+    return None
+
 
+def _witness_gate(
+    env: Dict[str, Any], expected_witness: Optional[str], deadline_ns: Optional[int] = None
+) -> Optional[Verdict]:
     # 6) Witness Gate
-    env_wo = dict(env)
-    env_wo.pop("witness_hash", None)
-    expected = compute_witness_hash(env_wo)
-    if witness_hash != expected:
+    if expected_witness is None:
+        env_wo = dict(env)
+        env_wo.pop("witness_hash", None)
+        expected_witness = compute_witness_hash(env_wo, deadline_ns)
+    if env.get("witness_hash") != expected_witness:
         return False, REASON["WITNESS"], {"stage": "witness", "detail": "witness_hash mismatch"}
-
-    return True, "OK", {"stage": "ok"}
+    return None
+
+
+# Gate facts: the anchor-independent part of a verdict, as a JSON object that can be persisted
+# and re-evaluated against rotated anchors with verify_facts() without re-reading the envelope.
+# Either {"version", "verdict": [ok, reason, debug]} when a gate before the anchor gates already
+# decided, or the IntentAnchor hashes, budget inputs and the coverage/witness outcomes. Envelopes
+# past the schema checks also carry "admission": {nodes, edges, depth}, since the admission
+# limits live in the anchors config and rank before every other gate. Facts taken from raw
+# input (raw=...) carry its "bytes" and byte-level "depth" instead, checked as admit_bytes() does:
+# before every other gate, including the schema checks.
+FACTS_VERSION = 2
+
+
+def final_facts(verdict: Verdict, raw: Optional[bytes] = None) -> Dict[str, Any]:
+    # Facts for a verdict that does not depend on the anchors (e.g. unparseable input)
+    ok, reason, debug = verdict
+    facts: Dict[str, Any] = {"version": FACTS_VERSION, "verdict": [ok, reason, debug]}
+    if raw is not None:
+        facts["admission"] = {"bytes": len(raw), "depth": json_bytes_depth(raw)}
+    return facts
+
+
+def gate_facts(
+    env: Dict[str, Any], expected_witness: Optional[str] = None, raw: Optional[bytes] = None
+) -> Dict[str, Any]:
+    # verify_facts(gate_facts(env), anchors) == verify(env, anchors) for any anchors, and
+    # verify_facts(gate_facts(env, raw=raw), anchors) == verify_bytes(raw, anchors) when env
+    # came from parse_envelope(raw).
+    # Unlike verify(), every anchor-independent gate is evaluated, including the witness.
+    s = _structural_gates(env)
+    if s.failure is not None and s.failure[2].get("stage") == "schema":
+        return final_facts(s.failure, raw)
+
+    tcc = env["tcc"]
+    admission = {"nodes": _list_len(tcc.get("nodes")), "edges": _list_len(tcc.get("edges"))}
+    if raw is None:
+        admission["depth"] = _json_depth(env)
+    else:
+        admission.update(bytes=len(raw), depth=json_bytes_depth(raw))
+    if s.failure is not None:
+        facts = final_facts(s.failure)
+        facts["admission"] = admission
+        return facts
+
+    def outcome(failure: Optional[Verdict]) -> Optional[List[Any]]:
+        return None if failure is None else [failure[1], failure[2]]
+
+    return {
+        "version": FACTS_VERSION,
+        "admission": admission,
+        "h_constitution": s.anchor_payload.get("h_constitution"),
+        "h_energy_policy": s.anchor_payload.get("h_energy_policy"),
+        "action_class": env["action_class"],
+        "energy_est_uj": env["energy_est_uj"],
+        "coverage": outcome(_coverage_gates(s.by_type)),
+        "witness": outcome(_witness_gate(env, expected_witness)),
+    }
+
+
+def verify_facts(facts: Dict[str, Any], anchors: AnchorsLike) -> Verdict:
+    # Re-evaluates the anchor and budget gates over persisted facts, in verify()'s gate order.
+    # Raises ValueError on facts this version cannot read.
+    if not isinstance(facts, dict) or facts.get("version") != FACTS_VERSION:
+        raise ValueError("unsupported gate facts")
+    try:
+        snapshot = as_snapshot(anchors)
+        size = facts.get("admission") or {}
+        from_raw = "bytes" in size
+        if from_raw:
+            failure = _raw_over_limits(size["bytes"], lambda: size["depth"], snapshot.admission)
+            if failure is not None:
+                return failure
+        if "nodes" in size:
+            # With raw input the depth was checked above, as verify_bytes() does
+            depth = (lambda limit: 0) if from_raw else (lambda limit: size["depth"])
+            failure = _over_limits(size["nodes"], size["edges"], depth, snapshot.admission)
+            if failure is not None:
+                return failure
+
+        if "verdict" in facts:
+            ok, reason, debug = facts["verdict"]
+            return ok, reason, dict(debug)
+
+        failure = _anchor_gates(facts, snapshot)
+        if failure is None and facts["coverage"] is not None:
+            failure = (False, facts["coverage"][0], dict(facts["coverage"][1]))
+        if failure is None:
+            failure = _budget_gate(facts["action_class"], facts["energy_est_uj"], snapshot)
+        if failure is None and facts["witness"] is not None:
+            failure = (False, facts["witness"][0], dict(facts["witness"][1]))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"malformed gate facts: {e!r}") from None
+    return failure or (True, "OK", {"stage": "ok"})
+
+
+def verify_bytes(raw: bytes, anchors: AnchorsLike) -> Tuple[bool, str, Dict[str, Any]]:
+    # Same verdict as verify(json.loads(raw), anchors), with the admission limits checked on
+    # the raw bytes first.
+    inadmissible = admit_bytes(raw, anchors)
+    if inadmissible is not None:
+        return inadmissible
+    try:
+        env = parse_envelope(raw)
+    except ValueError:
+        return False, REASON["SCHEMA"], {"stage": "schema", "detail": "invalid json"}
+    return verify(env, anchors, bytes_admitted=True)